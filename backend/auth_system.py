@@ -3,24 +3,73 @@ Authentication and Authorization System
 Implements JWT-based authentication with role-based access control
 """
 
-import jwt
+import base64
 import hashlib
+import hmac
+import os
 import secrets
-from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List
+import time
+from threading import RLock
+from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass
 from enum import Enum
+from types import MappingProxyType
 import logging
 
+import numpy as np
+import orjson
+from cachetools import TTLCache
+
+from time_utils import now_iso
+
 logger = logging.getLogger(__name__)
 
+# scrypt cost parameters for stored password hashes (n=2**14, r=8 uses 16 MiB per hash)
+_SCRYPT_N = 2 ** 14
+_SCRYPT_R = 8
+_SCRYPT_P = 1
+_SCRYPT_DKLEN = 32
+_SALT_BYTES = 16
+
+# Verified token payloads are reused for up to this many seconds (never past the token's exp)
+_TOKEN_CACHE_SIZE = 10_000
+_TOKEN_CACHE_TTL = 5
+
+# Repeated identical failed logins are rejected without rehashing for this many seconds
+_FAILED_AUTH_CACHE_SIZE = 4096
+_FAILED_AUTH_CACHE_TTL = 30
+
+def _b64url(data: bytes) -> bytes:
+    """Unpadded base64url encoding used by JWT segments"""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+def _b64url_decode(segment: bytes) -> bytes:
+    """Decode an unpadded base64url JWT segment"""
+    return base64.urlsafe_b64decode(segment + b"=" * (-len(segment) % 4))
+
+# Supported signing algorithms. HS256 is the interoperable default; BLAKE2B (keyed BLAKE2b-256)
+# is internal-only but faster on CPUs without SHA extensions. Set JWT_ALGORITHM to choose.
+_JWT_ALGORITHMS = ("HS256", "BLAKE2B")
+_JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+
+# JWT headers never change, so their encoded segments are built once
+_JWT_HEADERS_B64 = MappingProxyType({
+    algorithm: _b64url(orjson.dumps({"alg": algorithm, "typ": "JWT"})) for algorithm in _JWT_ALGORITHMS
+})
+
+class InvalidTokenError(Exception):
+    """Token is malformed or its signature does not verify"""
+
+class ExpiredSignatureError(InvalidTokenError):
+    """Token signature is valid but its exp claim has passed"""
+
 class UserRole(Enum):
     ADMIN = "admin"
     ANALYST = "analyst"
     VIEWER = "viewer"
     GUEST = "guest"
 
-@dataclass
+@dataclass(slots=True)
 class User:
     user_id: str
     username: str
@@ -29,132 +78,298 @@ class User:
     is_active: bool = True
     created_at: str = ""
     last_login: str = ""
-    permissions: List[str] = None
+    permissions: Tuple[str, ...] = ()
+
+# Permission required by each protected endpoint; unlisted endpoints require "read"
+_ENDPOINT_PERMISSIONS = MappingProxyType({
+    "/evaluate": "write",
+    "/health": "read",
+    "/metrics/framework": "read",
+    "/admin/users": "admin",
+    "/admin/analytics": "admin",
+    "/reports": "read"
+})
+
+# One bit per permission; roles and endpoints are stored as masks over these
+_PERM_BITS = MappingProxyType({"read": 1, "write": 2, "delete": 4, "admin": 8})
+
+# Small integer code per role for the column-wise user arrays
+_ROLE_CODES = MappingProxyType({role: code for code, role in enumerate(UserRole)})
+# Plain string per role for token payloads, avoiding the enum .value descriptor per token
+_ROLE_VALUES = MappingProxyType({role: role.value for role in UserRole})
+# Reverse lookup used instead of calling UserRole(value) per request
+_ROLE_FROM_VALUE = MappingProxyType({role.value: role for role in UserRole})
 
 class AuthenticationService:
     """Handles user authentication and JWT token management"""
     
-    def __init__(self, secret_key: str = None):
+    def __init__(self, secret_key: str = None, algorithm: str = None):
         self.secret_key = secret_key or secrets.token_urlsafe(32)
-        self.algorithm = "HS256"
+        self.secret_key_bytes = self.secret_key.encode()
+        self.algorithm = algorithm or _JWT_ALGORITHM
+        if self.algorithm not in _JWT_HEADERS_B64:
+            raise ValueError(f"Unsupported JWT algorithm: {self.algorithm}")
+        self._header_b64 = _JWT_HEADERS_B64[self.algorithm]
+        
+        # Keyed MAC state cloned per signature, so the key setup is only done once
+        if self.algorithm == "BLAKE2B":
+            # BLAKE2b keys are limited to 64 bytes; longer secrets are hashed down first
+            key = self.secret_key_bytes
+            if len(key) > hashlib.blake2b.MAX_KEY_SIZE:
+                key = hashlib.blake2b(key).digest()
+            self._mac_template = hashlib.blake2b(key=key, digest_size=32)
+        else:
+            self._mac_template = hmac.new(self.secret_key_bytes, digestmod=hashlib.sha256)
         self.token_expiry_hours = 24
         
+        # Recently verified token payloads keyed by raw token; failures are never cached
+        self._token_cache = TTLCache(maxsize=_TOKEN_CACHE_SIZE, ttl=_TOKEN_CACHE_TTL)
+        self._cache_lock = RLock()
+        
+        # Recently failed (username, password digest) pairs and how often they were rejected from it
+        self._failed_auth_cache = TTLCache(maxsize=_FAILED_AUTH_CACHE_SIZE, ttl=_FAILED_AUTH_CACHE_TTL)
+        self.cached_auth_rejections = 0
+        
         # In-memory user store (in production, use a database)
+        created_at = now_iso()
         self.users = {
             "admin": User(
                 user_id="admin_001",
                 username="admin",
                 email="admin@startup-evaluator.com",
                 role=UserRole.ADMIN,
-                created_at=datetime.now().isoformat(),
-                permissions=["read", "write", "delete", "admin"]
+                created_at=created_at,
+                permissions=("read", "write", "delete", "admin")
             ),
             "analyst": User(
                 user_id="analyst_001",
                 username="analyst",
                 email="analyst@startup-evaluator.com",
                 role=UserRole.ANALYST,
-                created_at=datetime.now().isoformat(),
-                permissions=["read", "write"]
+                created_at=created_at,
+                permissions=("read", "write")
             ),
             "viewer": User(
                 user_id="viewer_001",
                 username="viewer",
                 email="viewer@startup-evaluator.com",
                 role=UserRole.VIEWER,
-                created_at=datetime.now().isoformat(),
-                permissions=["read"]
+                created_at=created_at,
+                permissions=("read",)
             )
         }
         
-        # Password hashes (in production, use proper password hashing)
+        # Column-wise mirror of the user store: one dict probe plus an array read on the
+        # verify path, and whole-role updates as single vectorized assignments
+        self._user_list = list(self.users.values())
+        self._user_index = {user.username: index for index, user in enumerate(self._user_list)}
+        self._user_active = np.array([user.is_active for user in self._user_list], dtype=bool)
+        self._user_role = np.array([_ROLE_CODES[user.role] for user in self._user_list], dtype=np.int8)
+        
+        # Per-user random salts and scrypt password hashes
+        self.password_salts = {
+            username: secrets.token_bytes(_SALT_BYTES) for username in self.users
+        }
+        seed_passwords = {"admin": b"admin123", "analyst": b"analyst123", "viewer": b"viewer123"}
         self.password_hashes = {
-            "admin": self._hash_password("admin123"),
-            "analyst": self._hash_password("analyst123"),
-            "viewer": self._hash_password("viewer123")
+            username: hashlib.scrypt(
+                password, salt=self.password_salts[username],
+                n=_SCRYPT_N, r=_SCRYPT_R, p=_SCRYPT_P, dklen=_SCRYPT_DKLEN
+            )
+            for username, password in seed_passwords.items()
         }
     
-    def _hash_password(self, password: str) -> str:
-        """Hash password using SHA-256"""
-        return hashlib.sha256(password.encode()).hexdigest()
+    def set_user_active(self, username: str, active: bool):
+        """Activate or deactivate a single user"""
+        self._user_active[self._user_index[username]] = active
+        self.users[username].is_active = active
+    
+    def set_role_active(self, role: UserRole, active: bool) -> int:
+        """Activate or deactivate every user with the given role; returns how many matched"""
+        matches = self._user_role == _ROLE_CODES[role]
+        self._user_active[matches] = active
+        for index in np.flatnonzero(matches):
+            self._user_list[index].is_active = active
+        return int(matches.sum())
+    
+    def _hash_password(self, password: bytes, salt: bytes) -> bytes:
+        """Hash UTF-8 encoded password with scrypt using the user's salt"""
+        return hashlib.scrypt(
+            password, salt=salt, n=_SCRYPT_N, r=_SCRYPT_R, p=_SCRYPT_P, dklen=_SCRYPT_DKLEN
+        )
     
     def authenticate_user(self, username: str, password: str) -> Optional[User]:
         """Authenticate user with username and password"""
         try:
-            if username not in self.users:
-                logger.warning(f"Authentication failed: User {username} not found")
-                return None
-            
-            user = self.users[username]
-            if not user.is_active:
-                logger.warning(f"Authentication failed: User {username} is inactive")
-                return None
-            
-            password_hash = self.password_hashes.get(username)
-            if not password_hash or password_hash != self._hash_password(password):
-                logger.warning(f"Authentication failed: Invalid password for user {username}")
+            user = self._check_credentials(username, password.encode())
+            if user is None:
                 return None
             
             # Update last login
-            user.last_login = datetime.now().isoformat()
+            user.last_login = now_iso()
             
-            logger.info(f"User {username} authenticated successfully")
+            logger.info("User %s authenticated successfully", username)
             return user
             
         except Exception as e:
-            logger.error(f"Authentication error: {e}")
+            logger.error("Authentication error: %s", e)
+            return None
+    
+    def _check_credentials(self, username: str, password: bytes) -> Optional[User]:
+        """Return the active user matching the credentials, or None"""
+        index = self._user_index.get(username)
+        if index is None:
+            logger.warning("Authentication failed: User %s not found", username)
+            return None
+        
+        if not self._user_active[index]:
+            logger.warning("Authentication failed: User %s is inactive", username)
             return None
+        
+        user = self._user_list[index]
+        
+        # Only bad passwords are cached: they are what costs a scrypt hash, and caching
+        # inactive-user rejections would outlive a later set_user_active/set_role_active
+        failure_key = (username, hashlib.blake2b(password, digest_size=8).digest())
+        with self._cache_lock:
+            if failure_key in self._failed_auth_cache:
+                self.cached_auth_rejections += 1
+                return None
+        
+        password_hash = self.password_hashes.get(username)
+        if not password_hash or not hmac.compare_digest(
+            password_hash, self._hash_password(password, self.password_salts[username])
+        ):
+            logger.warning("Authentication failed: Invalid password for user %s", username)
+            with self._cache_lock:
+                self._failed_auth_cache[failure_key] = True
+            return None
+        
+        return user
     
     def generate_token(self, user: User) -> str:
         """Generate JWT token for authenticated user"""
         try:
+            now_ts = int(time.time())
             payload = {
                 "user_id": user.user_id,
                 "username": user.username,
                 "email": user.email,
-                "role": user.role.value,
+                "role": _ROLE_VALUES[user.role],
                 "permissions": user.permissions,
-                "iat": datetime.utcnow(),
-                "exp": datetime.utcnow() + timedelta(hours=self.token_expiry_hours)
+                "iat": now_ts,
+                "exp": now_ts + self.token_expiry_hours * 3600
             }
             
-            token = jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
-            logger.info(f"Token generated for user {user.username}")
+            signing_input = self._header_b64 + b"." + _b64url(orjson.dumps(payload))
+            mac = self._mac_template.copy()
+            mac.update(signing_input)
+            signature = mac.digest()
+            token = (signing_input + b"." + _b64url(signature)).decode()
+            logger.info("Token generated for user %s", user.username)
             return token
             
         except Exception as e:
-            logger.error(f"Token generation error: {e}")
+            logger.error("Token generation error: %s", e)
             raise
     
     def verify_token(self, token: str) -> Optional[Dict[str, Any]]:
         """Verify JWT token and return payload"""
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+            payload = self._decode_token(token)
             
             # Check if user still exists and is active
             username = payload.get("username")
-            if username not in self.users:
-                logger.warning(f"Token verification failed: User {username} not found")
+            index = self._user_index.get(username)
+            if index is None:
+                logger.warning("Token verification failed: User %s not found", username)
                 return None
             
-            user = self.users[username]
-            if not user.is_active:
-                logger.warning(f"Token verification failed: User {username} is inactive")
+            if not self._user_active[index]:
+                logger.warning("Token verification failed: User %s is inactive", username)
                 return None
             
-            logger.info(f"Token verified for user {username}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Token verified for user %s", username)
             return payload
             
-        except jwt.ExpiredSignatureError:
+        except ExpiredSignatureError:
             logger.warning("Token verification failed: Token expired")
             return None
-        except jwt.InvalidTokenError:
+        except InvalidTokenError:
             logger.warning("Token verification failed: Invalid token")
             return None
         except Exception as e:
-            logger.error(f"Token verification error: {e}")
+            logger.error("Token verification error: %s", e)
             return None
     
+    def verify_tokens_batch(self, tokens: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Verify a batch of tokens, checking each distinct token once; results keep input order"""
+        verified = {}
+        for token in tokens:
+            if token not in verified:
+                verified[token] = self.verify_token(token)
+        
+        results = []
+        seen = set()
+        for token in tokens:
+            payload = verified[token]
+            # Repeats get a deep copy, so no two results share the nested permissions list
+            results.append(orjson.loads(orjson.dumps(payload)) if payload is not None and token in seen else payload)
+            seen.add(token)
+        return results
+    
+    def _decode_token(self, token: str) -> Dict[str, Any]:
+        """Decode and verify a JWT, reusing the payload of a recently verified identical token"""
+        with self._cache_lock:
+            cached = self._token_cache.get(token)
+        
+        if cached is not None:
+            claims_json, exp = cached
+            if exp > time.time():
+                return orjson.loads(claims_json)
+        
+        payload = self._verify_signed_token(token)
+        # Cache the claims as JSON bytes rather than the dict, so every caller decodes its own
+        # copy and mutating a returned payload (or its permissions list) cannot leak to others
+        with self._cache_lock:
+            self._token_cache[token] = (orjson.dumps(payload), payload.get("exp", float("inf")))
+        return payload
+    
+    def _verify_signed_token(self, token: str) -> Dict[str, Any]:
+        """Check a token's structure, signature and expiry and return its claims"""
+        try:
+            signing_input, _, signature_b64 = token.encode().rpartition(b".")
+            if signing_input.count(b".") != 1:
+                raise InvalidTokenError("Not enough or too many segments")
+            
+            header_b64, _, payload_b64 = signing_input.partition(b".")
+            header = orjson.loads(_b64url_decode(header_b64))
+            signature = _b64url_decode(signature_b64)
+            payload = orjson.loads(_b64url_decode(payload_b64))
+        except ValueError as e:
+            raise InvalidTokenError(f"Malformed token: {e}") from e
+        
+        if not isinstance(header, dict) or header.get("alg") != self.algorithm:
+            raise InvalidTokenError("Unsupported token algorithm")
+        
+        mac = self._mac_template.copy()
+        mac.update(signing_input)
+        if not hmac.compare_digest(mac.digest(), signature):
+            raise InvalidTokenError("Signature verification failed")
+        
+        if not isinstance(payload, dict):
+            raise InvalidTokenError("Token payload is not an object")
+        
+        exp = payload.get("exp")
+        if exp is not None:
+            if not isinstance(exp, (int, float)):
+                raise InvalidTokenError("Expiration Time claim (exp) must be a number")
+            if exp <= time.time():
+                raise ExpiredSignatureError("Signature has expired")
+        
+        return payload
+    
     def refresh_token(self, token: str) -> Optional[str]:
         """Refresh JWT token"""
         try:
@@ -168,42 +383,36 @@ class AuthenticationService:
             return self.generate_token(user)
             
         except Exception as e:
-            logger.error(f"Token refresh error: {e}")
+            logger.error("Token refresh error: %s", e)
             return None
 
 class AuthorizationService:
     """Handles role-based access control and permissions"""
     
     def __init__(self):
-        self.role_permissions = {
-            UserRole.ADMIN: ["read", "write", "delete", "admin"],
-            UserRole.ANALYST: ["read", "write"],
-            UserRole.VIEWER: ["read"],
-            UserRole.GUEST: []
+        self.role_mask = {
+            UserRole.ADMIN: 0xF,
+            UserRole.ANALYST: 0x3,
+            UserRole.VIEWER: 0x1,
+            UserRole.GUEST: 0x0
+        }
+        self.endpoint_required_mask = {
+            endpoint: _PERM_BITS[permission] for endpoint, permission in _ENDPOINT_PERMISSIONS.items()
         }
     
     def has_permission(self, user_role: UserRole, required_permission: str) -> bool:
         """Check if user role has required permission"""
-        permissions = self.role_permissions.get(user_role, [])
-        return required_permission in permissions
+        return bool(self.role_mask.get(user_role, 0) & _PERM_BITS.get(required_permission, 0))
     
     def can_access_endpoint(self, user_role: UserRole, endpoint: str) -> bool:
         """Check if user can access specific endpoint"""
-        endpoint_permissions = {
-            "/evaluate": "write",
-            "/health": "read",
-            "/metrics/framework": "read",
-            "/admin/users": "admin",
-            "/admin/analytics": "admin",
-            "/reports": "read"
-        }
-        
-        required_permission = endpoint_permissions.get(endpoint, "read")
-        return self.has_permission(user_role, required_permission)
+        required_mask = self.endpoint_required_mask.get(endpoint, _PERM_BITS["read"])
+        return bool(self.role_mask.get(user_role, 0) & required_mask)
     
     def get_user_permissions(self, user_role: UserRole) -> List[str]:
         """Get all permissions for user role"""
-        return self.role_permissions.get(user_role, [])
+        mask = self.role_mask.get(user_role, 0)
+        return [permission for permission, bit in _PERM_BITS.items() if mask & bit]
 
 class SecurityMiddleware:
     """Middleware for handling authentication and authorization"""
@@ -211,19 +420,30 @@ class SecurityMiddleware:
     def __init__(self, auth_service: AuthenticationService, authz_service: AuthorizationService):
         self.auth_service = auth_service
         self.authz_service = authz_service
+        
+        # (role value, endpoint) decisions for every known endpoint, checked before any enum work
+        decisions = {
+            (role.value, endpoint): authz_service.can_access_endpoint(role, endpoint)
+            for role in UserRole
+            for endpoint in _ENDPOINT_PERMISSIONS
+        }
+        self._allow_set = frozenset(key for key, allowed in decisions.items() if allowed)
+        self._deny_set = frozenset(key for key, allowed in decisions.items() if not allowed)
     
     def extract_token_from_header(self, authorization_header: str) -> Optional[str]:
         """Extract JWT token from Authorization header"""
         if not authorization_header:
             return None
         
-        try:
-            scheme, token = authorization_header.split(" ", 1)
-            if scheme.lower() != "bearer":
-                return None
-            return token
-        except ValueError:
+        if authorization_header.startswith("Bearer "):
+            token = authorization_header[7:]
+        elif authorization_header[:7].lower() == "bearer ":
+            token = authorization_header[7:]
+        else:
             return None
+        
+        # A JWT never contains spaces; "Bearer a b" stays rejected without a per-request split
+        return token if " " not in token else None
     
     def authenticate_request(self, authorization_header: str) -> Optional[Dict[str, Any]]:
         """Authenticate request using JWT token"""
@@ -238,7 +458,14 @@ class SecurityMiddleware:
         if not user_payload:
             return False
         
-        user_role = UserRole(user_payload.get("role", "guest"))
+        role = user_payload.get("role", "guest")
+        endpoint_key = (role, endpoint)
+        if endpoint_key in self._allow_set:
+            return True
+        if endpoint_key in self._deny_set:
+            return False
+        
+        user_role = _ROLE_FROM_VALUE.get(role, UserRole.GUEST)
         return self.authz_service.can_access_endpoint(user_role, endpoint)
     
     def get_user_info(self, user_payload: Dict[str, Any]) -> Dict[str, Any]:
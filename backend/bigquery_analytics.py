@@ -3,54 +3,409 @@ BigQuery Analytics Service for Peer Comparison
 Provides sector benchmarking and startup analytics using BigQuery
 """
 
+import atexit
+import copy
+import functools
 import os
-import json
-from datetime import datetime, timedelta
+import queue
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, List, Optional, Tuple
+import cachetools
+import google.auth
+import orjson
+from google.auth.transport.requests import AuthorizedSession
 from google.cloud import bigquery
-from google.cloud.exceptions import NotFound, GoogleCloudError
+from google.cloud.exceptions import NotFound
+from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
 import logging
 
+try:
+    from google.cloud import bigquery_storage_v1
+    from google.cloud.bigquery_storage_v1 import types as write_types, writer as write_writer
+    from google.protobuf import descriptor_pb2, descriptor_pool, message_factory
+except ImportError:  # Storage Write API client is optional; rows then go through insert_rows_json
+    bigquery_storage_v1 = None
+
+try:
+    import pyarrow.compute as pc
+except ImportError:  # pyarrow is optional; dashboard rows are then aggregated in Python
+    pc = None
+
 logger = logging.getLogger(__name__)
 
+# Rows per streaming insert call (BigQuery recommends ~500; the hard cap is 50,000)
+_INSERT_CHUNK = int(os.getenv("BQ_INSERT_CHUNK", "500"))
+# The background flusher writes queued rows once the oldest has waited this many seconds
+_FLUSH_INTERVAL = float(os.getenv("BQ_FLUSH_INTERVAL", "0.2"))
+# Rows that may wait for the flusher before inserts start being rejected
+_QUEUE_SIZE = int(os.getenv("BQ_QUEUE_SIZE", "10000"))
+
+# Column used as the streaming insertId (best-effort dedup) for each buffered table
+_ROW_ID_FIELDS = {
+    "startups": "startup_id",
+    "evaluations": "evaluation_id"
+}
+
+# High-read sub-fields of evaluation_data stored as typed evaluations columns:
+# column -> (BigQuery type, path inside the workflow result)
+_PROMOTED_EVALUATION_FIELDS = {
+    "workflow_status": ("STRING", ("workflow_status",)),
+    "execution_time_seconds": ("FLOAT", ("execution_time",)),
+    "extraction_confidence": ("FLOAT", ("agent_results", "document_intelligence", "extraction_confidence")),
+    "market_size_billion": ("FLOAT", ("agent_results", "market_analysis", "sector_analysis", "market_size_billion")),
+    "market_growth_rate_percent": ("FLOAT", ("agent_results", "market_analysis", "sector_analysis", "growth_rate_percent")),
+    "competition_level": ("STRING", ("agent_results", "market_analysis", "sector_analysis", "competition_level")),
+    "runway_months": ("FLOAT", ("agent_results", "financial_analysis", "current_financials", "runway_months")),
+    "burn_rate_monthly": ("FLOAT", ("agent_results", "financial_analysis", "current_financials", "burn_rate_monthly")),
+    "risk_level": ("STRING", ("agent_results", "risk_assessment", "risk_level"))
+}
+
+_PROMOTED_CASTS = {"STRING": str, "FLOAT": float}
+
+# Timestamp columns stamped by the flusher, one shared value per written batch
+_BATCH_TIMESTAMP_FIELDS = {
+    "startups": ("created_at", "updated_at"),
+    "evaluations": ("evaluated_at",)
+}
+
+# Tables written through the Storage Write API default stream when the client library is installed
+_WRITE_API_TABLES = frozenset(("startups", "evaluations"))
+_USE_WRITE_API = bigquery_storage_v1 is not None and os.getenv("BQ_WRITE_API", "1") == "1"
+
+# Protobuf field type for each BigQuery column type (TIMESTAMP is sent as epoch microseconds)
+_PROTO_TYPES = {
+    "STRING": "TYPE_STRING",
+    "JSON": "TYPE_STRING",
+    "FLOAT": "TYPE_DOUBLE",
+    "FLOAT64": "TYPE_DOUBLE",
+    "INTEGER": "TYPE_INT64",
+    "INT64": "TYPE_INT64",
+    "BOOLEAN": "TYPE_BOOL",
+    "BOOL": "TYPE_BOOL",
+    "TIMESTAMP": "TYPE_INT64"
+}
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Keep-alive connections kept per host by the BigQuery HTTP session
+_HTTP_POOL = int(os.getenv("BQ_HTTP_POOL", "100"))
+
+# Read-mostly aggregates are served from memory for BQ_CACHE_TTL seconds
+_CACHE_TTL = int(os.getenv("BQ_CACHE_TTL", "120"))
+_benchmarks_cache = cachetools.TTLCache(maxsize=512, ttl=_CACHE_TTL)
+_benchmarks_cache_lock = threading.Lock()
+_dashboard_cache = cachetools.TTLCache(maxsize=1, ttl=_CACHE_TTL)
+_dashboard_cache_lock = threading.Lock()
+
+# Tables the dashboard aggregates are computed from
+_DASHBOARD_SOURCES = frozenset(("startups", "evaluations"))
+
+# Look-back windows of the peer and dashboard aggregates
+_PEER_WINDOW_DAYS = 365
+_DASHBOARD_WINDOW_DAYS = 182
+
+
+def _window_start(days: int) -> datetime:
+    """Start of a look-back window, truncated to midnight UTC so repeated queries share parameters and hit BigQuery's result cache"""
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    return today - timedelta(days=days)
+
+# Query text per dataset; only the parameters change between calls
+_SECTOR_BENCHMARKS_SQL = """
+SELECT 
+    metric_name,
+    percentile_25,
+    percentile_50,
+    percentile_75,
+    percentile_90,
+    average
+FROM `{dataset}.sector_benchmarks`
+WHERE sector = @sector
+ORDER BY metric_name
+"""
+
+_EXISTING_TABLES_SQL = """
+SELECT table_name
+FROM `{dataset}.INFORMATION_SCHEMA.TABLES`
+WHERE table_name IN ('startups', 'evaluations', 'sector_benchmarks')
+"""
+
+_PEER_ROLLUP_SQL = """
+SELECT *
+FROM `{dataset}.sector_dashboard_rollup`
+WHERE sector = @sector
+"""
+
+# One non-windowed aggregate: APPROX_QUANTILES is sort-free and only scalars come back
+_PEER_LIVE_SQL = """
+SELECT 
+    COUNT(*) as total_companies,
+    AVG(s.arr_crore) as avg_arr,
+    APPROX_QUANTILES(s.arr_crore, 100)[OFFSET(50)] as median_arr,
+    APPROX_QUANTILES(s.arr_crore, 100)[OFFSET(75)] as p75_arr,
+    APPROX_QUANTILES(s.arr_crore, 100)[OFFSET(90)] as p90_arr,
+    AVG(s.team_size) as avg_team_size,
+    AVG(e.financial_health_score) as avg_financial_score,
+    AVG(e.team_quality_score) as avg_team_score,
+    AVG(e.market_opportunity_score) as avg_market_score,
+    AVG(e.product_traction_score) as avg_traction_score,
+    AVG(e.overall_score) as avg_overall_score
+FROM `{dataset}.evaluations` e
+JOIN `{dataset}.startups` s
+USING (startup_id)
+WHERE s.sector = @sector
+AND e.evaluated_at >= @window_start
+"""
+
+_DASHBOARD_SQL = """
+SELECT 
+    s.sector,
+    COUNT(*) as total_startups,
+    AVG(e.overall_score) as avg_score,
+    AVG(e.financial_health_score) as avg_financial,
+    AVG(e.team_quality_score) as avg_team,
+    AVG(e.market_opportunity_score) as avg_market,
+    AVG(e.product_traction_score) as avg_traction,
+    AVG(e.risk_score) as avg_risk,
+    COUNT(CASE WHEN e.investment_recommendation = 'Strong Buy' THEN 1 END) as strong_buy_count,
+    COUNT(CASE WHEN e.investment_recommendation = 'Buy' THEN 1 END) as buy_count,
+    COUNT(CASE WHEN e.investment_recommendation = 'Hold' THEN 1 END) as hold_count,
+    COUNT(CASE WHEN e.investment_recommendation = 'Sell' THEN 1 END) as sell_count
+FROM `{dataset}.evaluations` e
+JOIN `{dataset}.startups` s
+ON e.startup_id = s.startup_id
+WHERE e.evaluated_at >= @window_start
+GROUP BY s.sector
+ORDER BY total_startups DESC
+"""
+
+# Bytes a single query may bill before BigQuery aborts it
+_MAX_BYTES = int(os.getenv("BQ_MAX_BYTES", "10000000000"))
+
+# Settings shared by every query; the client merges them into each call's job config
+_BASE_JOB_CONFIG = bigquery.QueryJobConfig(use_query_cache=True, maximum_bytes_billed=_MAX_BYTES)
+
+
+def _pooled_http_session() -> AuthorizedSession:
+    """Create an authorized session whose connection pool fits concurrent queries from the web tier"""
+    credentials, _ = google.auth.default(scopes=bigquery.Client.SCOPE)
+    session = AuthorizedSession(credentials)
+    session.mount("https://", HTTPAdapter(pool_connections=_HTTP_POOL, pool_maxsize=_HTTP_POOL, max_retries=3))
+    return session
+
+
+def _row_message_class(table_name: str, schema: List[Any]):
+    """Build a proto2 message class whose fields mirror a BigQuery table schema"""
+    field_proto = descriptor_pb2.FieldDescriptorProto
+    file_proto = descriptor_pb2.FileDescriptorProto(
+        name=f"{table_name}_row.proto",
+        package="startup_analytics",
+        syntax="proto2"
+    )
+    message_proto = file_proto.message_type.add(name=f"{table_name.title().replace('_', '')}Row")
+    
+    for number, field in enumerate(schema, start=1):
+        message_proto.field.add(
+            name=field.name,
+            number=number,
+            type=getattr(field_proto, _PROTO_TYPES[field.field_type]),
+            label=field_proto.LABEL_REPEATED if field.mode == "REPEATED" else field_proto.LABEL_OPTIONAL
+        )
+    
+    pool = descriptor_pool.DescriptorPool()
+    pool.AddSerializedFile(file_proto.SerializeToString())
+    descriptor = pool.FindMessageTypeByName(f"startup_analytics.{message_proto.name}")
+    try:
+        return message_factory.GetMessageClass(descriptor)
+    except AttributeError:  # protobuf < 4.22
+        return message_factory.MessageFactory(pool).GetPrototype(descriptor)
+
+
+class StartupRow(BaseModel):
+    """Validated startups row; unknown keys in the input are ignored"""
+    startup_id: str = ""
+    company_name: str = ""
+    sector: str = ""
+    stage: str = ""
+    arr_crore: Optional[float] = None
+    team_size: Optional[int] = None
+    valuation_crore: Optional[float] = None
+    revenue_model: Optional[str] = None
+    founders: List[str] = []
+
+
+class EvaluationRow(BaseModel):
+    """Validated evaluations row, without the evaluation_data payload; unknown keys are ignored"""
+    evaluation_id: str = ""
+    startup_id: str = ""
+    financial_health_score: float = 0.0
+    team_quality_score: float = 0.0
+    market_opportunity_score: float = 0.0
+    product_traction_score: float = 0.0
+    risk_score: float = 0.0
+    overall_score: float = 0.0
+    investment_recommendation: str = ""
+    confidence_level: str = ""
+
+
+def _promoted_evaluation_fields(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Typed column values for the promoted sub-fields of a workflow result; uncastable values become NULL"""
+    # The fields also stay in the evaluation_data JSON, so existing readers of those paths keep working
+    promoted = {}
+    for column, (field_type, path) in _PROMOTED_EVALUATION_FIELDS.items():
+        parent = data
+        for key in path[:-1]:
+            parent = parent.get(key)
+            if not isinstance(parent, dict):
+                break
+        
+        if not isinstance(parent, dict) or path[-1] not in parent:
+            continue
+        
+        value = parent[path[-1]]
+        try:
+            promoted[column] = None if value is None else _PROMOTED_CASTS[field_type](value)
+        except (TypeError, ValueError):
+            promoted[column] = None
+    
+    return promoted
+
+
+def _utc_now_rfc3339() -> str:
+    """Current UTC time as an RFC 3339 string, the form BigQuery accepts for TIMESTAMP columns"""
+    return datetime.utcnow().isoformat(timespec="microseconds") + "Z"
+
+
+@functools.lru_cache(maxsize=64)
+def _timestamp_micros(value: str) -> int:
+    """Convert an ISO-8601 timestamp (naive values are UTC) to epoch microseconds"""
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return (moment - _EPOCH) // timedelta(microseconds=1)
+
 class BigQueryAnalyticsService:
     """Service for startup analytics and peer comparison using BigQuery"""
     
+    # Storage Write API client shared by every instance in the process
+    _shared_write_client = None
+    _shared_write_client_lock = threading.Lock()
+    
+    # Storage Read API client shared by every instance, used for columnar result downloads
+    _shared_read_client = None
+    _shared_read_client_lock = threading.Lock()
+    
+    # Datasets whose tables have already been created by this process
+    _initialized_datasets: set = set()
+    
     def __init__(self, project_id: str, dataset_id: str):
         self.project_id = project_id
         self.dataset_id = dataset_id
-        self.client = bigquery.Client(project=project_id)
+        self.client = bigquery.Client(
+            project=project_id,
+            _http=_pooled_http_session(),
+            default_query_job_config=_BASE_JOB_CONFIG
+        )
         self.dataset_ref = self.client.dataset(dataset_id)
         
+        # Render the query text for this dataset once
+        dataset = f"{project_id}.{dataset_id}"
+        self._existing_tables_sql = _EXISTING_TABLES_SQL.format(dataset=dataset)
+        self._sector_benchmarks_sql = _SECTOR_BENCHMARKS_SQL.format(dataset=dataset)
+        self._peer_rollup_sql = _PEER_ROLLUP_SQL.format(dataset=dataset)
+        self._peer_live_sql = _PEER_LIVE_SQL.format(dataset=dataset)
+        self._dashboard_sql = _DASHBOARD_SQL.format(dataset=dataset)
+        
+        # Table metadata by table id, fetched once
+        self._tables: Dict[str, Any] = {}
+        
+        # Queries currently running, by key, so concurrent identical calls share one job
+        self._inflight: Dict[Tuple[str, str], Future] = {}
+        self._inflight_lock = threading.Lock()
+        
+        # (table name, row) pairs waiting for the background flusher; a threading.Event
+        # in the queue asks the flusher to write everything before it and then set the event
+        self._queue: queue.Queue = queue.Queue(maxsize=_QUEUE_SIZE)
+        self._flusher = threading.Thread(target=self._drain, name="bigquery-flusher", daemon=True)
+        self._flusher.start()
+        
+        # Storage Write API: one long-lived default-stream connection per table; rows are
+        # written by the single flusher thread, so appends never need more than one stream
+        self._write_client = self._get_write_client() if _USE_WRITE_API else None
+        self._row_formats: Dict[str, Tuple[Any, frozenset, Any]] = {}
+        self._append_streams: Dict[str, Any] = {}
+        self._append_lock = threading.Lock()
+        atexit.register(self.close)
+        
         # Initialize tables
-        self._create_tables()
+        if (project_id, dataset_id) not in self._initialized_datasets:
+            self._create_tables()
+            self._initialized_datasets.add((project_id, dataset_id))
+    
+    def _table(self, table_id: str):
+        """Return a table's metadata, fetching it on first use"""
+        if table_id not in self._tables:
+            self._tables[table_id] = self.client.get_table(table_id)
+        return self._tables[table_id]
     
     def _create_tables(self):
         """Create necessary BigQuery tables if they don't exist"""
         try:
-            # Create dataset if it doesn't exist
-            dataset = bigquery.Dataset(self.dataset_ref)
-            dataset.location = "US"  # or your preferred location
-            dataset.description = "Startup evaluation analytics dataset"
+            creators = {
+                "startups": self._create_startups_table,
+                "evaluations": self._create_evaluations_table,
+                "sector_benchmarks": self._create_sector_benchmarks_table
+            }
             
+            # One metadata query tells which tables already exist; it fails if the dataset doesn't
             try:
-                self.client.create_dataset(dataset, timeout=30)
+                existing = {row.table_name for row in self.client.query(self._existing_tables_sql).result()}
+            except NotFound:
+                dataset = bigquery.Dataset(self.dataset_ref)
+                dataset.location = "US"  # or your preferred location
+                dataset.description = "Startup evaluation analytics dataset"
+                self.client.create_dataset(dataset, exists_ok=True, timeout=30)
                 logger.info(f"Created dataset {self.dataset_id}")
-            except GoogleCloudError:
-                logger.info(f"Dataset {self.dataset_id} already exists")
+                existing = set()
             
-            # Create startups table
-            self._create_startups_table()
+            if "evaluations" in existing:
+                self._add_promoted_columns()
             
-            # Create evaluations table
-            self._create_evaluations_table()
+            missing = [create for name, create in creators.items() if name not in existing]
+            if not missing:
+                logger.info(f"All tables in {self.dataset_id} already exist")
+                return
             
-            # Create sector_benchmarks table
-            self._create_sector_benchmarks_table()
+            # The table DDL calls are independent round trips, so issue them concurrently
+            with ThreadPoolExecutor(max_workers=len(missing)) as executor:
+                futures = [executor.submit(create) for create in missing]
+                for future in futures:
+                    future.result()
             
         except Exception as e:
             logger.error(f"Error creating BigQuery tables: {e}")
     
+    def _add_promoted_columns(self):
+        """Add promoted evaluation columns to an evaluations table created before they existed"""
+        table_id = f"{self.project_id}.{self.dataset_id}.evaluations"
+        table = self._table(table_id)
+        present = {field.name for field in table.schema}
+        
+        added = [
+            bigquery.SchemaField(column, field_type, mode="NULLABLE")
+            for column, (field_type, _) in _PROMOTED_EVALUATION_FIELDS.items()
+            if column not in present
+        ]
+        if added:
+            table.schema = list(table.schema) + added
+            self._tables[table_id] = self.client.update_table(table, ["schema"])
+            logger.info(f"Added {len(added)} promoted column(s) to {table_id}")
+    
     def _create_startups_table(self):
         """Create startups table schema"""
         table_id = f"{self.project_id}.{self.dataset_id}.startups"
@@ -71,12 +426,10 @@ class BigQueryAnalyticsService:
         
         table = bigquery.Table(table_id, schema=schema)
         table.description = "Startup company information"
+        table.clustering_fields = ["sector", "stage"]
         
-        try:
-            self.client.create_table(table)
-            logger.info(f"Created table {table_id}")
-        except GoogleCloudError:
-            logger.info(f"Table {table_id} already exists")
+        self.client.create_table(table, exists_ok=True)
+        logger.info(f"Ensured table {table_id}")
     
     def _create_evaluations_table(self):
         """Create evaluations table schema"""
@@ -95,16 +448,21 @@ class BigQueryAnalyticsService:
             bigquery.SchemaField("confidence_level", "STRING", mode="REQUIRED"),
             bigquery.SchemaField("evaluated_at", "TIMESTAMP", mode="REQUIRED"),
             bigquery.SchemaField("evaluation_data", "JSON", mode="NULLABLE")
+        ] + [
+            bigquery.SchemaField(column, field_type, mode="NULLABLE")
+            for column, (field_type, _) in _PROMOTED_EVALUATION_FIELDS.items()
         ]
         
         table = bigquery.Table(table_id, schema=schema)
         table.description = "Startup evaluation results"
+        table.time_partitioning = bigquery.TimePartitioning(
+            type_=bigquery.TimePartitioningType.MONTH,
+            field="evaluated_at"
+        )
+        table.clustering_fields = ["startup_id"]
         
-        try:
-            self.client.create_table(table)
-            logger.info(f"Created table {table_id}")
-        except GoogleCloudError:
-            logger.info(f"Table {table_id} already exists")
+        self.client.create_table(table, exists_ok=True)
+        logger.info(f"Ensured table {table_id}")
     
     def _create_sector_benchmarks_table(self):
         """Create sector benchmarks table schema"""
@@ -124,122 +482,327 @@ class BigQueryAnalyticsService:
         table = bigquery.Table(table_id, schema=schema)
         table.description = "Sector benchmarking data"
         
-        try:
-            self.client.create_table(table)
-            logger.info(f"Created table {table_id}")
-        except GoogleCloudError:
-            logger.info(f"Table {table_id} already exists")
+        self.client.create_table(table, exists_ok=True)
+        logger.info(f"Ensured table {table_id}")
     
     def insert_startup_data(self, startup_data: Dict[str, Any]) -> bool:
-        """Insert startup data into BigQuery"""
+        """Queue startup data for a batched insert into BigQuery"""
         try:
-            table_id = f"{self.project_id}.{self.dataset_id}.startups"
-            table = self.client.get_table(table_id)
-            
-            # Prepare row data
-            row = {
-                "startup_id": startup_data.get("startup_id", ""),
-                "company_name": startup_data.get("company_name", ""),
-                "sector": startup_data.get("sector", ""),
-                "stage": startup_data.get("stage", ""),
-                "arr_crore": startup_data.get("arr_crore"),
-                "team_size": startup_data.get("team_size"),
-                "valuation_crore": startup_data.get("valuation_crore"),
-                "revenue_model": startup_data.get("revenue_model"),
-                "founders": startup_data.get("founders", []),
-                "created_at": datetime.utcnow(),
-                "updated_at": datetime.utcnow()
-            }
-            
-            errors = self.client.insert_rows_json(table, [row])
-            
-            if errors:
-                logger.error(f"BigQuery insert errors: {errors}")
-                return False
+            # Validate and coerce the row in one pass
+            row = StartupRow.model_validate(startup_data).model_dump()
             
-            logger.info(f"Startup data inserted: {startup_data.get('startup_id')}")
-            return True
+            logger.info(f"Startup data queued: {startup_data.get('startup_id')}")
+            return self._buffer_row("startups", row)
             
         except Exception as e:
             logger.error(f"Error inserting startup data: {e}")
             return False
     
     def insert_evaluation_data(self, evaluation_data: Dict[str, Any]) -> bool:
-        """Insert evaluation data into BigQuery"""
+        """Queue evaluation data for a batched insert into BigQuery"""
         try:
-            table_id = f"{self.project_id}.{self.dataset_id}.evaluations"
-            table = self.client.get_table(table_id)
-            
-            # Prepare row data
-            row = {
-                "evaluation_id": evaluation_data.get("evaluation_id", ""),
-                "startup_id": evaluation_data.get("startup_id", ""),
-                "financial_health_score": evaluation_data.get("financial_health_score", 0.0),
-                "team_quality_score": evaluation_data.get("team_quality_score", 0.0),
-                "market_opportunity_score": evaluation_data.get("market_opportunity_score", 0.0),
-                "product_traction_score": evaluation_data.get("product_traction_score", 0.0),
-                "risk_score": evaluation_data.get("risk_score", 0.0),
-                "overall_score": evaluation_data.get("overall_score", 0.0),
-                "investment_recommendation": evaluation_data.get("investment_recommendation", ""),
-                "confidence_level": evaluation_data.get("confidence_level", ""),
-                "evaluated_at": datetime.utcnow(),
-                "evaluation_data": json.dumps(evaluation_data.get("evaluation_data", {}))
-            }
+            workflow_result = evaluation_data.get("evaluation_data") or {}
+            
+            # Validate and coerce the row in one pass
+            row = EvaluationRow.model_validate(evaluation_data).model_dump()
+            row["evaluation_data"] = orjson.dumps(workflow_result, option=orjson.OPT_NON_STR_KEYS).decode()
+            row.update(_promoted_evaluation_fields(workflow_result))
+            
+            logger.info(f"Evaluation data queued: {evaluation_data.get('evaluation_id')}")
+            return self._buffer_row("evaluations", row)
+            
+        except Exception as e:
+            logger.error(f"Error inserting evaluation data: {e}")
+            return False
+    
+    def _buffer_row(self, table_name: str, row: Dict[str, Any]) -> bool:
+        """Queue a row for the background flusher without waiting on BigQuery"""
+        try:
+            self._queue.put_nowait((table_name, row))
+            return True
+        except queue.Full:
+            logger.error(f"BigQuery insert queue is full, dropping {table_name} row")
+            return False
+    
+    def _drain(self):
+        """Background loop: collect queued rows per table and write them in chunks"""
+        pending: Dict[str, List[Dict[str, Any]]] = {}
+        deadline = None
+        
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
             
-            errors = self.client.insert_rows_json(table, [row])
+            if isinstance(item, threading.Event):
+                self._write_pending(pending)
+                pending, deadline = {}, None
+                item.set()
+                continue
+            
+            if item is not None:
+                table_name, row = item
+                rows = pending.setdefault(table_name, [])
+                rows.append(row)
+                if deadline is None:
+                    deadline = time.monotonic() + _FLUSH_INTERVAL
+                if len(rows) < _INSERT_CHUNK and time.monotonic() < deadline:
+                    continue
+            
+            self._write_pending(pending)
+            pending, deadline = {}, None
+    
+    def _write_pending(self, pending: Dict[str, List[Dict[str, Any]]]):
+        """Write the rows gathered by the flusher, one batch per table"""
+        now = _utc_now_rfc3339()
+        for table_name, rows in pending.items():
+            if not rows:
+                continue
+            
+            for field in _BATCH_TIMESTAMP_FIELDS.get(table_name, ()):
+                for row in rows:
+                    row[field] = now
+            
+            try:
+                self.insert_rows_batch(table_name, rows)
+            except Exception as e:
+                logger.error(f"Error writing queued {table_name} rows: {e}")
+            
+            if table_name in _DASHBOARD_SOURCES:
+                with _dashboard_cache_lock:
+                    _dashboard_cache.clear()
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every row queued so far has been written; returns False on timeout"""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+    
+    def close(self):
+        """Flush queued rows and close the Storage Write API streams"""
+        self.flush(timeout=30)
+        
+        with self._append_lock:
+            streams = list(self._append_streams.values())
+            self._append_streams.clear()
+        
+        for append_stream in streams:
+            try:
+                append_stream.close()
+            except Exception as e:
+                logger.warning(f"Error closing append stream: {e}")
+    
+    def insert_rows_batch(self, table_name: str, rows: List[Dict[str, Any]], chunk_size: int = _INSERT_CHUNK) -> bool:
+        """Stream rows into a table with one insert call per chunk of rows"""
+        if self._write_client is not None and table_name in _WRITE_API_TABLES:
+            rows = self._append_rows(table_name, rows, chunk_size)
+            if not rows:
+                return True
+        
+        try:
+            # insert_rows_json needs no schema, so the table id is passed without fetching metadata
+            table_id = f"{self.project_id}.{self.dataset_id}.{table_name}"
+            row_id_field = _ROW_ID_FIELDS.get(table_name)
+            
+            errors = []
+            for start in range(0, len(rows), chunk_size):
+                chunk = rows[start:start + chunk_size]
+                row_ids = (
+                    [row.get(row_id_field) or str(uuid.uuid4()) for row in chunk]
+                    if row_id_field else None
+                )
+                errors.extend(self.client.insert_rows_json(table_id, chunk, row_ids=row_ids))
             
             if errors:
                 logger.error(f"BigQuery insert errors: {errors}")
                 return False
             
-            logger.info(f"Evaluation data inserted: {evaluation_data.get('evaluation_id')}")
+            logger.info(f"Inserted {len(rows)} row(s) into {table_name}")
             return True
             
         except Exception as e:
-            logger.error(f"Error inserting evaluation data: {e}")
+            logger.error(f"Error inserting rows into {table_name}: {e}")
             return False
     
-    def get_sector_benchmarks(self, sector: str) -> Dict[str, Any]:
-        """Get sector benchmarking data"""
-        try:
-            query = f"""
-            SELECT 
-                metric_name,
-                percentile_25,
-                percentile_50,
-                percentile_75,
-                percentile_90,
-                average
-            FROM `{self.project_id}.{self.dataset_id}.sector_benchmarks`
-            WHERE sector = @sector
-            ORDER BY metric_name
-            """
-            
-            job_config = bigquery.QueryJobConfig(
-                query_parameters=[
-                    bigquery.ScalarQueryParameter("sector", "STRING", sector)
-                ]
+    @classmethod
+    def _get_write_client(cls):
+        """Return the process-wide Storage Write API client, creating it on first use"""
+        with cls._shared_write_client_lock:
+            if cls._shared_write_client is None:
+                cls._shared_write_client = bigquery_storage_v1.BigQueryWriteClient()
+            return cls._shared_write_client
+    
+    @classmethod
+    def _get_read_client(cls):
+        """Return the process-wide Storage Read API client, or None when the library is missing"""
+        if bigquery_storage_v1 is None:
+            return None
+        with cls._shared_read_client_lock:
+            if cls._shared_read_client is None:
+                cls._shared_read_client = bigquery_storage_v1.BigQueryReadClient()
+            return cls._shared_read_client
+    
+    def _row_format(self, table_name: str) -> Tuple[Any, frozenset, Any]:
+        """Return the table's row message class, TIMESTAMP columns and AppendRows request template"""
+        # Called with self._append_lock held
+        if table_name not in self._row_formats:
+            table = self._table(f"{self.project_id}.{self.dataset_id}.{table_name}")
+            message_class = _row_message_class(table_name, table.schema)
+            timestamp_fields = frozenset(
+                field.name for field in table.schema if field.field_type == "TIMESTAMP"
             )
             
-            query_job = self.client.query(query, job_config=job_config)
-            results = query_job.result()
-            
-            benchmarks = {}
-            for row in results:
-                benchmarks[row.metric_name] = {
-                    "p25": row.percentile_25,
-                    "p50": row.percentile_50,
-                    "p75": row.percentile_75,
-                    "p90": row.percentile_90,
-                    "average": row.average
-                }
+            proto_descriptor = descriptor_pb2.DescriptorProto()
+            message_class.DESCRIPTOR.CopyToProto(proto_descriptor)
+            proto_data = write_types.AppendRowsRequest.ProtoData()
+            proto_data.writer_schema = write_types.ProtoSchema(proto_descriptor=proto_descriptor)
             
-            return benchmarks
+            request_template = write_types.AppendRowsRequest()
+            parent = self._write_client.table_path(self.project_id, self.dataset_id, table_name)
+            request_template.write_stream = f"{parent}/_default"
+            request_template.proto_rows = proto_data
             
+            self._row_formats[table_name] = (message_class, timestamp_fields, request_template)
+        
+        return self._row_formats[table_name]
+    
+    def _append_stream(self, table_name: str) -> Tuple[Any, Any, frozenset]:
+        """Return the table's AppendRows stream, opening it on first use"""
+        # Called with self._append_lock held
+        message_class, timestamp_fields, request_template = self._row_format(table_name)
+        append_stream = self._append_streams.get(table_name)
+        if append_stream is None:
+            append_stream = write_writer.AppendRowsStream(self._write_client, request_template)
+            self._append_streams[table_name] = append_stream
+            logger.info(f"Opened Storage Write API stream for {table_name}")
+        
+        return append_stream, message_class, timestamp_fields
+    
+    def _append_rows(self, table_name: str, rows: List[Dict[str, Any]], chunk_size: int) -> List[Dict[str, Any]]:
+        """Append rows over the Storage Write API; returns the rows that still need a streaming insert"""
+        with self._append_lock:
+            try:
+                append_stream, message_class, timestamp_fields = self._append_stream(table_name)
+            except Exception as e:
+                logger.warning(f"Storage Write API unavailable for {table_name}, using insert_rows_json: {e}")
+                return rows
+            
+            remaining = self._send_rows(table_name, append_stream, message_class, timestamp_fields, rows, chunk_size)
+            
+            # A stream with a failed append is dropped so the next flush opens a fresh one
+            if remaining:
+                del self._append_streams[table_name]
+        
+        if remaining:
+            try:
+                append_stream.close()
+            except Exception as e:
+                logger.warning(f"Error closing append stream: {e}")
+        else:
+            logger.info(f"Appended {len(rows)} row(s) to {table_name}")
+        
+        return remaining
+    
+    def _send_rows(self, table_name: str, append_stream: Any, message_class: Any, timestamp_fields: frozenset,
+                   rows: List[Dict[str, Any]], chunk_size: int) -> List[Dict[str, Any]]:
+        """Send rows on an append stream in chunks; returns the rows whose appends failed"""
+        # Send every chunk before waiting so the appends are pipelined on the stream
+        pending = []
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            try:
+                proto_rows = write_types.ProtoRows()
+                for row in chunk:
+                    message = message_class()
+                    for name, value in row.items():
+                        if value is None:
+                            continue
+                        if name in timestamp_fields:
+                            value = _timestamp_micros(value)
+                        if isinstance(value, list):
+                            getattr(message, name).extend(value)
+                        else:
+                            setattr(message, name, value)
+                    proto_rows.serialized_rows.append(message.SerializeToString())
+                
+                request = write_types.AppendRowsRequest()
+                proto_data = write_types.AppendRowsRequest.ProtoData()
+                proto_data.rows = proto_rows
+                request.proto_rows = proto_data
+                pending.append((chunk, append_stream.send(request)))
+            except Exception as e:
+                logger.warning(f"Error appending rows to {table_name}: {e}")
+                pending.append((chunk, None))
+        
+        remaining = []
+        for chunk, future in pending:
+            try:
+                if future is None:
+                    raise RuntimeError("append was not sent")
+                future.result()
+            except Exception as e:
+                logger.warning(f"Append to {table_name} failed, using insert_rows_json: {e}")
+                remaining.extend(chunk)
+        
+        return remaining
+    
+    def _single_flight(self, key: Tuple[str, str], func, *args):
+        """Run func once for concurrent callers with the same key; the others wait for its result"""
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        
+        if not leader:
+            return future.result()
+        
+        try:
+            result = func(*args)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+    
+    def get_sector_benchmarks(self, sector: str) -> Dict[str, Any]:
+        """Get sector benchmarking data"""
+        try:
+            # The cached dict is shared by every request; callers get their own copy to mutate
+            return copy.deepcopy(self._single_flight(("benchmarks", sector), self._query_sector_benchmarks, sector))
         except Exception as e:
             logger.error(f"Error getting sector benchmarks: {e}")
             return {}
     
+    @cachetools.cached(cache=_benchmarks_cache, key=lambda self, sector: sector, lock=_benchmarks_cache_lock)
+    def _query_sector_benchmarks(self, sector: str) -> Dict[str, Any]:
+        """Query sector benchmarks; failures raise so they are not cached"""
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[
+                bigquery.ScalarQueryParameter("sector", "STRING", sector)
+            ]
+        )
+        
+        query_job = self.client.query(self._sector_benchmarks_sql, job_config=job_config)
+        results = query_job.result()
+        
+        benchmarks = {}
+        for row in results:
+            benchmarks[row.metric_name] = {
+                "p25": row.percentile_25,
+                "p50": row.percentile_50,
+                "p75": row.percentile_75,
+                "p90": row.percentile_90,
+                "average": row.average
+            }
+        
+        return benchmarks
+    
     def get_peer_comparison(self, startup_data: Dict[str, Any]) -> Dict[str, Any]:
         """Get peer comparison analysis"""
         try:
@@ -247,45 +810,7 @@ class BigQueryAnalyticsService:
             arr_crore = startup_data.get("arr_crore", 0)
             team_size = startup_data.get("team_size", 0)
             
-            query = f"""
-            WITH sector_data AS (
-                SELECT 
-                    arr_crore,
-                    team_size,
-                    financial_health_score,
-                    team_quality_score,
-                    market_opportunity_score,
-                    product_traction_score,
-                    overall_score
-                FROM `{self.project_id}.{self.dataset_id}.evaluations` e
-                JOIN `{self.project_id}.{self.dataset_id}.startups` s
-                ON e.startup_id = s.startup_id
-                WHERE s.sector = @sector
-                AND e.evaluated_at >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL 12 MONTH)
-            )
-            SELECT 
-                COUNT(*) as total_companies,
-                AVG(arr_crore) as avg_arr,
-                PERCENTILE_CONT(arr_crore, 0.5) OVER() as median_arr,
-                PERCENTILE_CONT(arr_crore, 0.75) OVER() as p75_arr,
-                PERCENTILE_CONT(arr_crore, 0.9) OVER() as p90_arr,
-                AVG(team_size) as avg_team_size,
-                AVG(financial_health_score) as avg_financial_score,
-                AVG(team_quality_score) as avg_team_score,
-                AVG(market_opportunity_score) as avg_market_score,
-                AVG(product_traction_score) as avg_traction_score,
-                AVG(overall_score) as avg_overall_score
-            FROM sector_data
-            """
-            
-            job_config = bigquery.QueryJobConfig(
-                query_parameters=[
-                    bigquery.ScalarQueryParameter("sector", "STRING", sector)
-                ]
-            )
-            
-            query_job = self.client.query(query, job_config=job_config)
-            results = list(query_job.result())
+            results = self._single_flight(("peer", sector), self._query_peer_rows, sector)
             
             if not results:
                 return self._get_default_peer_comparison()
@@ -320,6 +845,32 @@ class BigQueryAnalyticsService:
             logger.error(f"Error getting peer comparison: {e}")
             return self._get_default_peer_comparison()
     
+    def _query_peer_rows(self, sector: str) -> List[Any]:
+        """Query a sector's peer aggregates from the daily rollup, falling back to live rows until it has the sector"""
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[
+                bigquery.ScalarQueryParameter("sector", "STRING", sector)
+            ]
+        )
+        
+        try:
+            results = list(self.client.query(self._peer_rollup_sql, job_config=job_config).result())
+        except NotFound:
+            results = []
+        
+        if not results:
+            job_config = bigquery.QueryJobConfig(
+                query_parameters=[
+                    bigquery.ScalarQueryParameter("sector", "STRING", sector),
+                    bigquery.ScalarQueryParameter("window_start", "TIMESTAMP", _window_start(_PEER_WINDOW_DAYS))
+                ]
+            )
+            
+            query_job = self.client.query(self._peer_live_sql, job_config=job_config)
+            results = list(query_job.result())
+        
+        return results
+    
     def _calculate_percentile(self, value: float, avg: float, p75: float, p90: float) -> float:
         """Calculate percentile for a value based on sector data"""
         if value <= avg:
@@ -367,75 +918,157 @@ class BigQueryAnalyticsService:
     def get_analytics_dashboard_data(self) -> Dict[str, Any]:
         """Get analytics data for dashboard"""
         try:
-            query = f"""
-            SELECT 
-                s.sector,
-                COUNT(*) as total_startups,
-                AVG(e.overall_score) as avg_score,
-                AVG(e.financial_health_score) as avg_financial,
-                AVG(e.team_quality_score) as avg_team,
-                AVG(e.market_opportunity_score) as avg_market,
-                AVG(e.product_traction_score) as avg_traction,
-                AVG(e.risk_score) as avg_risk,
-                COUNT(CASE WHEN e.investment_recommendation = 'Strong Buy' THEN 1 END) as strong_buy_count,
-                COUNT(CASE WHEN e.investment_recommendation = 'Buy' THEN 1 END) as buy_count,
-                COUNT(CASE WHEN e.investment_recommendation = 'Hold' THEN 1 END) as hold_count,
-                COUNT(CASE WHEN e.investment_recommendation = 'Sell' THEN 1 END) as sell_count
-            FROM `{self.project_id}.{self.dataset_id}.evaluations` e
-            JOIN `{self.project_id}.{self.dataset_id}.startups` s
-            ON e.startup_id = s.startup_id
-            WHERE e.evaluated_at >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL 6 MONTH)
-            GROUP BY s.sector
-            ORDER BY total_startups DESC
-            """
-            
-            query_job = self.client.query(query)
-            results = list(query_job.result())
-            
-            dashboard_data = {
-                "sector_analysis": [],
-                "total_evaluations": sum(row.total_startups for row in results),
-                "average_scores": {
-                    "overall": sum(row.avg_score for row in results) / len(results) if results else 0,
-                    "financial": sum(row.avg_financial for row in results) / len(results) if results else 0,
-                    "team": sum(row.avg_team for row in results) / len(results) if results else 0,
-                    "market": sum(row.avg_market for row in results) / len(results) if results else 0,
-                    "traction": sum(row.avg_traction for row in results) / len(results) if results else 0,
-                    "risk": sum(row.avg_risk for row in results) / len(results) if results else 0
-                },
-                "recommendation_distribution": {
-                    "strong_buy": sum(row.strong_buy_count for row in results),
-                    "buy": sum(row.buy_count for row in results),
-                    "hold": sum(row.hold_count for row in results),
-                    "sell": sum(row.sell_count for row in results)
-                }
+            # The cached dict is shared by every request; callers get their own copy to mutate
+            return copy.deepcopy(self._query_dashboard_data())
+        except Exception as e:
+            logger.error(f"Error getting analytics dashboard data: {e}")
+            return {}
+    
+    @cachetools.cached(cache=_dashboard_cache, key=lambda self: "dashboard", lock=_dashboard_cache_lock)
+    def _query_dashboard_data(self) -> Dict[str, Any]:
+        """Query dashboard aggregates; failures raise so they are not cached"""
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[
+                bigquery.ScalarQueryParameter("window_start", "TIMESTAMP", _window_start(_DASHBOARD_WINDOW_DAYS))
+            ]
+        )
+        
+        # Dry-run first so an oversized scan is rejected before anything is billed
+        dry_run_config = bigquery.QueryJobConfig(
+            query_parameters=job_config.query_parameters,
+            dry_run=True,
+            use_query_cache=False
+        )
+        dry_run_job = self.client.query(self._dashboard_sql, job_config=dry_run_config)
+        logger.info(f"Dashboard query will process {dry_run_job.total_bytes_processed} bytes")
+        if dry_run_job.total_bytes_processed > _MAX_BYTES:
+            raise RuntimeError(
+                f"Dashboard query would process {dry_run_job.total_bytes_processed} bytes, "
+                f"above the BQ_MAX_BYTES limit of {_MAX_BYTES}"
+            )
+        
+        query_job = self.client.query(self._dashboard_sql, job_config=job_config)
+        
+        if pc is not None:
+            # Columnar download (Storage Read API for large results) and vectorized aggregates
+            table = query_job.result().to_arrow(
+                bqstorage_client=self._get_read_client(),
+                create_bqstorage_client=False
+            )
+            return self._dashboard_from_arrow(table)
+        
+        # Accumulate every total in the same pass that builds the per-sector rows
+        sector_analysis = []
+        total_startups = 0
+        score_totals = [0.0] * 6
+        strong_buy = buy = hold = sell = 0
+        
+        for row in query_job.result():
+            sector_analysis.append({
+                "sector": row.sector,
+                "total_startups": row.total_startups,
+                "avg_score": row.avg_score,
+                "avg_financial": row.avg_financial,
+                "avg_team": row.avg_team,
+                "avg_market": row.avg_market,
+                "avg_traction": row.avg_traction,
+                "avg_risk": row.avg_risk,
+                "strong_buy_count": row.strong_buy_count,
+                "buy_count": row.buy_count,
+                "hold_count": row.hold_count,
+                "sell_count": row.sell_count
+            })
+            total_startups += row.total_startups
+            score_totals[0] += row.avg_score
+            score_totals[1] += row.avg_financial
+            score_totals[2] += row.avg_team
+            score_totals[3] += row.avg_market
+            score_totals[4] += row.avg_traction
+            score_totals[5] += row.avg_risk
+            strong_buy += row.strong_buy_count
+            buy += row.buy_count
+            hold += row.hold_count
+            sell += row.sell_count
+        
+        n = len(sector_analysis)
+        overall, financial, team, market, traction, risk = (
+            [total / n for total in score_totals] if n else [0] * 6
+        )
+        
+        dashboard_data = {
+            "sector_analysis": sector_analysis,
+            "total_evaluations": total_startups,
+            "average_scores": {
+                "overall": overall,
+                "financial": financial,
+                "team": team,
+                "market": market,
+                "traction": traction,
+                "risk": risk
+            },
+            "recommendation_distribution": {
+                "strong_buy": strong_buy,
+                "buy": buy,
+                "hold": hold,
+                "sell": sell
+            }
+        }
+        
+        return dashboard_data
+    
+    def _dashboard_from_arrow(self, table) -> Dict[str, Any]:
+        """Build dashboard data from an Arrow result using column-wise sums and means"""
+        def column_total(name: str):
+            return pc.sum(table.column(name)).as_py() or 0
+        
+        def column_mean(name: str) -> float:
+            return pc.mean(table.column(name)).as_py() or 0
+        
+        return {
+            "sector_analysis": table.to_pylist(),
+            "total_evaluations": column_total("total_startups"),
+            "average_scores": {
+                "overall": column_mean("avg_score"),
+                "financial": column_mean("avg_financial"),
+                "team": column_mean("avg_team"),
+                "market": column_mean("avg_market"),
+                "traction": column_mean("avg_traction"),
+                "risk": column_mean("avg_risk")
+            },
+            "recommendation_distribution": {
+                "strong_buy": column_total("strong_buy_count"),
+                "buy": column_total("buy_count"),
+                "hold": column_total("hold_count"),
+                "sell": column_total("sell_count")
             }
+        }
+    
+    def bulk_load(self, table_name: str, rows: List[Dict[str, Any]]) -> bool:
+        """Append rows with a load job instead of streaming inserts, for seeds and historical backfills"""
+        try:
+            table_id = f"{self.project_id}.{self.dataset_id}.{table_name}"
+            job_config = bigquery.LoadJobConfig(
+                source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
+                write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
+                schema=self._table(table_id).schema
+            )
+            
+            # The rows are uploaded as NDJSON with the job itself, so no staging bucket is needed
+            load_job = self.client.load_table_from_json(rows, table_id, job_config=job_config)
+            load_job.result()
             
-            for row in results:
-                dashboard_data["sector_analysis"].append({
-                    "sector": row.sector,
-                    "total_startups": row.total_startups,
-                    "avg_score": row.avg_score,
-                    "avg_financial": row.avg_financial,
-                    "avg_team": row.avg_team,
-                    "avg_market": row.avg_market,
-                    "avg_traction": row.avg_traction,
-                    "avg_risk": row.avg_risk,
-                    "strong_buy_count": row.strong_buy_count,
-                    "buy_count": row.buy_count,
-                    "hold_count": row.hold_count,
-                    "sell_count": row.sell_count
-                })
-            
-            return dashboard_data
+            logger.info(f"Loaded {len(rows)} row(s) into {table_name}")
+            return True
             
         except Exception as e:
-            logger.error(f"Error getting analytics dashboard data: {e}")
-            return {}
+            logger.error(f"Error loading rows into {table_name}: {e}")
+            return False
     
     def seed_sample_data(self):
         """Seed sample data for testing"""
         try:
+            now = _utc_now_rfc3339()
+            
             # Sample sector benchmarks
             benchmarks_data = [
                 {
@@ -446,7 +1079,7 @@ class BigQueryAnalyticsService:
                     "percentile_75": 2.8,
                     "percentile_90": 5.5,
                     "average": 2.1,
-                    "updated_at": datetime.utcnow()
+                    "updated_at": now
                 },
                 {
                     "sector": "AI/ML",
@@ -456,25 +1089,22 @@ class BigQueryAnalyticsService:
                     "percentile_75": 25,
                     "percentile_90": 45,
                     "average": 18,
-                    "updated_at": datetime.utcnow()
+                    "updated_at": now
                 }
             ]
             
-            table_id = f"{self.project_id}.{self.dataset_id}.sector_benchmarks"
-            table = self.client.get_table(table_id)
-            
-            errors = self.client.insert_rows_json(table, benchmarks_data)
-            if errors:
-                logger.error(f"Error seeding sample data: {errors}")
-            else:
+            if self.bulk_load("sector_benchmarks", benchmarks_data):
+                with _benchmarks_cache_lock:
+                    _benchmarks_cache.clear()
                 logger.info("Sample data seeded successfully")
                 
         except Exception as e:
             logger.error(f"Error seeding sample data: {e}")
 
 # Global instance
+@functools.lru_cache(maxsize=1)
 def get_analytics_service() -> BigQueryAnalyticsService:
-    """Get BigQuery analytics service instance"""
+    """Get the process-wide BigQuery analytics service instance"""
     project_id = os.getenv("PROJECT_ID", "startup-ai-evaluator")
     dataset_id = os.getenv("DATASET_ID", "startup_evaluation")
     
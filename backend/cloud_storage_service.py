@@ -3,24 +3,98 @@ Cloud Storage Service for Document Management
 Handles file upload, storage, and retrieval using Google Cloud Storage
 """
 
+import functools
+import io
 import os
 import hashlib
 import mimetypes
-from datetime import datetime, timedelta
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, Optional, List, BinaryIO
 from google.cloud import storage
+from google.cloud.storage import transfer_manager
 from google.cloud.exceptions import NotFound, GoogleCloudError
+from requests.adapters import HTTPAdapter
 import logging
 
+from time_utils import now_iso
+
 logger = logging.getLogger(__name__)
 
+# Only the fields get_storage_stats reads, plus name, which the client needs to build each blob; keeps listing pages small
+_STATS_FIELDS = "items(name,size,contentType),prefixes,nextPageToken"
+_LIST_FIELDS = "items(name,size,contentType,timeCreated,updated,metadata),nextPageToken"
+_CLEANUP_FIELDS = "items(name,timeCreated),nextPageToken"
+_LIST_PAGE_SIZE = 1000
+# GCS accepts at most 100 calls per batch request
+_DELETE_BATCH_SIZE = 100
+_STATS_WORKERS = 10
+# Files below this go up in a single request; larger ones use resumable chunks
+_SINGLE_UPLOAD_MAX = 8 * 1024 * 1024
+# Keep-alive connections per host; must cover the transfer worker count
+_HTTP_POOL = 32
+# Resumable upload chunk size; GCS requires a multiple of 256 KiB
+_UPLOAD_CHUNK_SIZE = int(os.getenv("GCS_UPLOAD_CHUNK_SIZE", str(16 * 1024 * 1024)))
+
+def _clean_char(code: int):
+    """Translation for one code point: kept if alphanumeric or one of .-_, otherwise dropped"""
+    char = chr(code)
+    return char if char.isalnum() or char in ".-_" else None
+
+class _FilenameCleaner(dict):
+    """str.translate table that keeps alphanumerics and .-_; ASCII is precomputed, other code points are not cached"""
+    
+    def __missing__(self, code: int):
+        # Storing these would let client-chosen filenames grow the table without bound
+        return _clean_char(code)
+
+_CLEAN_TABLE = _FilenameCleaner((code, _clean_char(code)) for code in range(128))
+
+@functools.lru_cache(maxsize=2)
+def _date_folder(minute: int) -> str:
+    """UTC YYYY/MM/DD folder for a minute since the epoch, matching the UTC upload_timestamp"""
+    return datetime.fromtimestamp(minute * 60, timezone.utc).strftime("%Y/%m/%d")
+
+class _HashingReader(io.BytesIO):
+    """BytesIO that feeds sha256 with each byte the first time it is read"""
+    
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self._hash = hashlib.sha256()
+        self._hashed = 0
+    
+    def read(self, size: int = -1) -> bytes:
+        start = self.tell()
+        chunk = super().read(size)
+        end = start + len(chunk)
+        # Resumable retries seek back and re-read; only hash bytes not seen yet
+        if start <= self._hashed < end:
+            self._hash.update(chunk[self._hashed - start:])
+            self._hashed = end
+        return chunk
+    
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
 class CloudStorageService:
     """Service for managing documents in Google Cloud Storage"""
     
+    # Files at or above this size are uploaded as parallel multipart chunks
+    MPU_THRESHOLD = 150 * 1024 * 1024
+    MPU_CHUNK = 32 * 1024 * 1024
+    MPU_WORKERS = 10
+    # Downloads above this size are fetched as parallel ranged GETs; 0 turns the size probe off
+    PARALLEL_DOWNLOAD_THRESHOLD = int(os.getenv("GCS_PARALLEL_DOWNLOAD_MIN", str(200 * 1024 * 1024)))
+    
     def __init__(self, project_id: str, bucket_name: str):
         self.project_id = project_id
         self.bucket_name = bucket_name
         self.client = storage.Client(project=project_id)
+        # AuthorizedSession is thread-safe; widen its pool so concurrent transfers get their own sockets
+        self.client._http.mount("https://", HTTPAdapter(pool_connections=_HTTP_POOL, pool_maxsize=_HTTP_POOL))
         self.bucket = None
         
         try:
@@ -38,17 +112,18 @@ class CloudStorageService:
     def generate_file_path(self, filename: str, user_id: str, file_type: str = "documents") -> str:
         """Generate organized file path for storage"""
         # Create organized folder structure
-        timestamp = datetime.now().strftime("%Y/%m/%d")
-        file_hash = hashlib.md5(f"{filename}{user_id}{timestamp}".encode()).hexdigest()[:8]
+        timestamp = _date_folder(int(time.time() // 60))
+        # Uniqueness only, no security property needed
+        file_hash = hashlib.blake2b(f"{filename}{user_id}{timestamp}".encode(), digest_size=4).hexdigest()
         
         # Clean filename
-        clean_filename = "".join(c for c in filename if c.isalnum() or c in ".-_")
+        clean_filename = filename.translate(_CLEAN_TABLE)
         
         return f"{file_type}/{user_id}/{timestamp}/{file_hash}_{clean_filename}"
     
     def upload_file(self, file_content: bytes, filename: str, user_id: str, 
-                   metadata: Dict[str, str] = None) -> Dict[str, Any]:
-        """Upload file to Cloud Storage"""
+                   metadata: Dict[str, str] = None, make_public: bool = False) -> Dict[str, Any]:
+        """Upload file to Cloud Storage; files stay private unless make_public, use generate_signed_url for access"""
         try:
             # Generate file path
             file_path = self.generate_file_path(filename, user_id)
@@ -61,14 +136,19 @@ class CloudStorageService:
             if content_type:
                 blob.content_type = content_type
             
+            size = len(file_content)
+            # Chunked uploads hash the bytes as they are sent instead of up front
+            stream_hash = _SINGLE_UPLOAD_MAX <= size < self.MPU_THRESHOLD
+            
             # Set metadata
             blob_metadata = {
                 "original_filename": filename,
                 "uploaded_by": user_id,
-                "upload_timestamp": datetime.now().isoformat(),
-                "file_size": str(len(file_content)),
-                "file_hash": hashlib.sha256(file_content).hexdigest()
+                "upload_timestamp": now_iso(),
+                "file_size": str(size)
             }
+            if not stream_hash:
+                blob_metadata["file_hash"] = hashlib.sha256(file_content).hexdigest()
             
             if metadata:
                 blob_metadata.update(metadata)
@@ -76,17 +156,30 @@ class CloudStorageService:
             blob.metadata = blob_metadata
             
             # Upload file
-            blob.upload_from_string(file_content)
-            
-            # Make blob publicly readable (optional)
-            blob.make_public()
+            if size >= self.MPU_THRESHOLD:
+                self._upload_multipart(blob, file_content, content_type)
+            elif size < _SINGLE_UPLOAD_MAX:
+                blob.chunk_size = None
+                blob.upload_from_string(file_content, content_type=content_type)
+            else:
+                blob.chunk_size = _UPLOAD_CHUNK_SIZE
+                stream = _HashingReader(file_content)
+                blob.upload_from_file(stream, size=size, content_type=content_type)
+                if "file_hash" not in blob_metadata:
+                    blob_metadata["file_hash"] = stream.hexdigest()
+                    blob.metadata = blob_metadata
+                    blob.patch()
+            
+            # Make blob publicly readable (optional; an extra ACL call that fails on uniform-access buckets)
+            if make_public:
+                blob.make_public()
             
             logger.info(f"File uploaded successfully: {file_path}")
             
             return {
                 "success": True,
                 "file_path": file_path,
-                "public_url": blob.public_url,
+                "public_url": blob.public_url if make_public else None,
                 "gs_uri": f"gs://{self.bucket_name}/{file_path}",
                 "metadata": blob_metadata,
                 "size_bytes": len(file_content)
@@ -105,19 +198,54 @@ class CloudStorageService:
                 "error": f"Upload failed: {str(e)}"
             }
     
-    def download_file(self, file_path: str) -> Optional[bytes]:
-        """Download file from Cloud Storage"""
+    def _upload_multipart(self, blob, file_content: bytes, content_type: Optional[str]):
+        """Upload a large file as concurrent XML multipart chunks"""
+        with tempfile.NamedTemporaryFile() as tmp:
+            tmp.write(file_content)
+            tmp.flush()
+            transfer_manager.upload_chunks_concurrently(
+                tmp.name,
+                blob,
+                content_type=content_type,
+                chunk_size=self.MPU_CHUNK,
+                worker_type=transfer_manager.THREAD,
+                max_workers=self.MPU_WORKERS
+            )
+    
+    def _download_ranged(self, blob) -> bytes:
+        """Download a large blob as concurrent ranged chunks"""
+        with tempfile.NamedTemporaryFile() as tmp:
+            transfer_manager.download_chunks_concurrently(
+                blob,
+                tmp.name,
+                chunk_size=self.MPU_CHUNK,
+                worker_type=transfer_manager.THREAD,
+                max_workers=self.MPU_WORKERS
+            )
+            tmp.seek(0)
+            return tmp.read()
+    
+    def download_file(self, file_path: str, size_bytes: Optional[int] = None) -> Optional[bytes]:
+        """Download file from Cloud Storage, as parallel ranged chunks above PARALLEL_DOWNLOAD_THRESHOLD"""
         try:
             blob = self.bucket.blob(file_path)
-            
-            if not blob.exists():
-                logger.warning(f"File not found: {file_path}")
-                return None
-            
-            content = blob.download_as_bytes()
+            threshold = self.PARALLEL_DOWNLOAD_THRESHOLD
+            if threshold and (size_bytes is None or size_bytes > threshold):
+                # One metadata GET: the size when the caller has none from a listing, and the
+                # server-side size and generation the chunk boundaries need
+                blob.reload()
+                size_bytes = blob.size
+            
+            if threshold and size_bytes and size_bytes > threshold:
+                content = self._download_ranged(blob)
+            else:
+                content = blob.download_as_bytes()
             logger.info(f"File downloaded successfully: {file_path}")
             return content
             
+        except NotFound:
+            logger.warning(f"File not found: {file_path}")
+            return None
         except GoogleCloudError as e:
             logger.error(f"Cloud Storage download error: {e}")
             return None
@@ -125,30 +253,30 @@ class CloudStorageService:
             logger.error(f"File download error: {e}")
             return None
     
+    def _blob_to_metadata(self, blob) -> Dict[str, Any]:
+        """Build the metadata dict from an already populated blob"""
+        return {
+            "file_path": blob.name,
+            "size_bytes": blob.size,
+            "content_type": blob.content_type,
+            "created": blob.time_created.isoformat() if blob.time_created else None,
+            "updated": blob.updated.isoformat() if blob.updated else None,
+            "public_url": blob.public_url,
+            "gs_uri": f"gs://{self.bucket_name}/{blob.name}",
+            "metadata": blob.metadata or {}
+        }
+    
     def get_file_metadata(self, file_path: str) -> Optional[Dict[str, Any]]:
         """Get file metadata from Cloud Storage"""
         try:
             blob = self.bucket.blob(file_path)
-            
-            if not blob.exists():
-                logger.warning(f"File not found: {file_path}")
-                return None
-            
             blob.reload()
             
-            metadata = {
-                "file_path": file_path,
-                "size_bytes": blob.size,
-                "content_type": blob.content_type,
-                "created": blob.time_created.isoformat() if blob.time_created else None,
-                "updated": blob.updated.isoformat() if blob.updated else None,
-                "public_url": blob.public_url,
-                "gs_uri": f"gs://{self.bucket_name}/{file_path}",
-                "metadata": blob.metadata or {}
-            }
-            
-            return metadata
+            return self._blob_to_metadata(blob)
             
+        except NotFound:
+            logger.warning(f"File not found: {file_path}")
+            return None
         except GoogleCloudError as e:
             logger.error(f"Cloud Storage metadata error: {e}")
             return None
@@ -160,15 +288,14 @@ class CloudStorageService:
         """Delete file from Cloud Storage"""
         try:
             blob = self.bucket.blob(file_path)
-            
-            if not blob.exists():
-                logger.warning(f"File not found for deletion: {file_path}")
-                return False
-            
             blob.delete()
             logger.info(f"File deleted successfully: {file_path}")
             return True
             
+        except NotFound:
+            # Already gone; callers report this as not found
+            logger.warning(f"File not found for deletion: {file_path}")
+            return False
         except GoogleCloudError as e:
             logger.error(f"Cloud Storage delete error: {e}")
             return False
@@ -180,13 +307,15 @@ class CloudStorageService:
         """List all files for a specific user"""
         try:
             prefix = f"{file_type}/{user_id}/"
-            blobs = self.client.list_blobs(self.bucket_name, prefix=prefix)
+            # The listing already carries every field we report, so no per-blob reload
+            blobs = self.client.list_blobs(
+                self.bucket_name,
+                prefix=prefix,
+                fields=_LIST_FIELDS,
+                page_size=_LIST_PAGE_SIZE
+            )
             
-            files = []
-            for blob in blobs:
-                metadata = self.get_file_metadata(blob.name)
-                if metadata:
-                    files.append(metadata)
+            files = [self._blob_to_metadata(blob) for blob in blobs]
             
             logger.info(f"Listed {len(files)} files for user {user_id}")
             return files
@@ -201,12 +330,8 @@ class CloudStorageService:
     def generate_signed_url(self, file_path: str, expiration_hours: int = 1) -> Optional[str]:
         """Generate signed URL for private file access"""
         try:
+            # Signing is local; a missing object surfaces as 404 when the URL is used
             blob = self.bucket.blob(file_path)
-            
-            if not blob.exists():
-                logger.warning(f"File not found for signed URL: {file_path}")
-                return None
-            
             url = blob.generate_signed_url(
                 version="v4",
                 expiration=datetime.utcnow() + timedelta(hours=expiration_hours),
@@ -229,12 +354,24 @@ class CloudStorageService:
             cutoff_date = datetime.utcnow() - timedelta(days=days_old)
             deleted_count = 0
             
-            blobs = self.client.list_blobs(self.bucket_name)
-            for blob in blobs:
-                if blob.time_created and blob.time_created.replace(tzinfo=None) < cutoff_date:
-                    blob.delete()
-                    deleted_count += 1
-                    logger.info(f"Deleted old file: {blob.name}")
+            blobs = self.client.list_blobs(
+                self.bucket_name,
+                fields=_CLEANUP_FIELDS,
+                page_size=_LIST_PAGE_SIZE
+            )
+            victims = [
+                blob.name for blob in blobs
+                if blob.time_created and blob.time_created.replace(tzinfo=None) < cutoff_date
+            ]
+            
+            # Deletes are metadata calls, so they can share one multipart batch request
+            for start in range(0, len(victims), _DELETE_BATCH_SIZE):
+                chunk = victims[start:start + _DELETE_BATCH_SIZE]
+                with self.client.batch():
+                    for name in chunk:
+                        self.bucket.blob(name).delete()
+                deleted_count += len(chunk)
+                logger.info(f"Deleted {len(chunk)} old files")
             
             logger.info(f"Cleanup completed: {deleted_count} files deleted")
             return deleted_count
@@ -246,28 +383,72 @@ class CloudStorageService:
             logger.error(f"File cleanup error: {e}")
             return 0
     
-    def get_storage_stats(self) -> Dict[str, Any]:
-        """Get storage statistics"""
+    def enable_auto_cleanup(self, days_old: int = 30) -> bool:
+        """Install a bucket lifecycle rule so GCS deletes old files server-side"""
         try:
-            blobs = list(self.client.list_blobs(self.bucket_name))
-            
-            total_files = len(blobs)
-            total_size = sum(blob.size for blob in blobs if blob.size)
+            self.bucket.reload()
+            self.bucket.add_lifecycle_delete_rule(age=days_old)
+            self.bucket.patch()
+            logger.info(f"Lifecycle cleanup enabled for files older than {days_old} days")
+            return True
             
-            # Group by file type
-            file_types = {}
-            for blob in blobs:
+        except GoogleCloudError as e:
+            logger.error(f"Cloud Storage lifecycle error: {e}")
+            return False
+        except Exception as e:
+            logger.error(f"Lifecycle configuration error: {e}")
+            return False
+    
+    def _tally_blobs(self, prefix: str = None, delimiter: str = None):
+        """Count files, bytes and content types under a prefix, returning any sub-prefixes"""
+        total_files = 0
+        total_size = 0
+        file_types = Counter()
+        
+        blobs = self.client.list_blobs(
+            self.bucket_name,
+            prefix=prefix,
+            delimiter=delimiter,
+            fields=_STATS_FIELDS,
+            page_size=_LIST_PAGE_SIZE
+        )
+        for page in blobs.pages:
+            for blob in page:
+                total_files += 1
+                total_size += blob.size or 0
                 if blob.content_type:
-                    file_type = blob.content_type.split('/')[0]
-                    file_types[file_type] = file_types.get(file_type, 0) + 1
+                    file_types[blob.content_type.partition('/')[0]] += 1
+        
+        return total_files, total_size, file_types, sorted(blobs.prefixes)
+    
+    def get_storage_stats(self) -> Dict[str, Any]:
+        """Get storage statistics"""
+        try:
+            # Page tokens are sequential, so fan out over the file_type/user_id folders instead
+            total_files, total_size, file_types, type_prefixes = self._tally_blobs(delimiter="/")
+            
+            with ThreadPoolExecutor(max_workers=_STATS_WORKERS) as executor:
+                user_prefixes = []
+                for files, size, types, prefixes in executor.map(
+                    lambda prefix: self._tally_blobs(prefix, "/"), type_prefixes
+                ):
+                    total_files += files
+                    total_size += size
+                    file_types.update(types)
+                    user_prefixes.extend(prefixes)
+                
+                for files, size, types, _ in executor.map(self._tally_blobs, user_prefixes):
+                    total_files += files
+                    total_size += size
+                    file_types.update(types)
             
             stats = {
                 "total_files": total_files,
                 "total_size_bytes": total_size,
                 "total_size_mb": round(total_size / (1024 * 1024), 2),
-                "file_types": file_types,
+                "file_types": dict(file_types),
                 "bucket_name": self.bucket_name,
-                "last_updated": datetime.now().isoformat()
+                "last_updated": now_iso()
             }
             
             return stats
@@ -280,6 +461,7 @@ class CloudStorageService:
             return {}
 
 # Global instance
+@functools.lru_cache(maxsize=1)
 def get_storage_service() -> CloudStorageService:
     """Get Cloud Storage service instance"""
     project_id = os.getenv("PROJECT_ID", "startup-ai-evaluator")
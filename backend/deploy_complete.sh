@@ -37,6 +37,16 @@ gcloud services enable vision.googleapis.com
 echo "📊 Creating BigQuery dataset..."
 bq mk --dataset $PROJECT_ID:$DATASET_ID
 
+# Schedule the daily sector rollup read by peer comparison
+gcloud services enable bigquerydatatransfer.googleapis.com
+ROLLUP_SQL=$(sed -e "s/\${PROJECT_ID}/$PROJECT_ID/g" -e "s/\${DATASET_ID}/$DATASET_ID/g" backend/scheduled_queries/refresh_sector_rollup.sql)
+bq mk --transfer_config \
+  --project_id=$PROJECT_ID \
+  --data_source=scheduled_query \
+  --display_name="Refresh sector rollup" \
+  --schedule="every 24 hours" \
+  --params="$(python3 -c 'import json, sys; print(json.dumps({"query": sys.argv[1]}))' "$ROLLUP_SQL")"
+
 # Create Cloud Storage bucket
 echo "🗄️ Creating Cloud Storage bucket..."
 gsutil mb gs://$BUCKET_NAME
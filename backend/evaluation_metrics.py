@@ -5,13 +5,307 @@ Implements the 5-category evaluation system based on the CSV framework
 
 import json
 import logging
-from typing import Dict, Any, List, Optional
+import re
+import numpy as np
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
-from datetime import datetime
+
+from time_utils import now_iso
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Sector keyword families; substring matches, so "healthtech" still counts as tech
+_TECH_SECTOR_RE = re.compile(r"tech|ai|ml|saas|fintech")
+_STABLE_SECTOR_RE = re.compile(r"health|education|ecommerce")
+_HIGH_RISK_SECTOR_RE = re.compile(r"crypto|blockchain|nft")
+
+# Piecewise score tables shared by the per-record and batch scorers. For ladders, bucket 0
+# is a missing/non-positive value, then one bucket per threshold crossed; factor templates
+# are indexed the same way and formatted only when a caller asks for collect_factors
+_ARR_EDGES = (1, 5, 10)
+_ARR_POINTS = (0, 10, 20, 25, 30)
+_ARR_FACTORS = (
+    None,
+    "Early stage ARR: ₹{arr_crore:.1f} crores",
+    "Moderate ARR: ₹{arr_crore:.1f} crores",
+    "Good ARR: ₹{arr_crore:.1f} crores",
+    "Strong ARR: ₹{arr_crore:.1f} crores"
+)
+_REVENUE_MODEL_POINTS = (25, 20, 15, 10)
+_REVENUE_MODEL_FACTORS = (
+    "Recurring revenue model",
+    "Marketplace/commission model",
+    "One-time/license model",
+    "Other revenue model"
+)
+_VALUATION_EDGES = (20, 50, 100)
+_VALUATION_POINTS = (0, 10, 15, 20, 25)
+_VALUATION_FACTORS = (
+    None,
+    "Early stage valuation: ₹{valuation:.1f} crores",
+    "Moderate valuation: ₹{valuation:.1f} crores",
+    "Good valuation: ₹{valuation:.1f} crores",
+    "High valuation: ₹{valuation:.1f} crores"
+)
+_MRR_EDGES = (20, 50)
+_MRR_POINTS = (0, 5, 8, 10)
+_MRR_FACTORS = (
+    None,
+    "Early MRR: ₹{mrr_lakh:.1f} lakhs",
+    "Good MRR: ₹{mrr_lakh:.1f} lakhs",
+    "Strong MRR: ₹{mrr_lakh:.1f} lakhs"
+)
+_CHURN_EDGES = (5, 10)
+_CHURN_POINTS = (0, 5, 3, 1)
+_CHURN_FACTORS = (
+    None,
+    "Low churn: {churn_rate:.1f}%",
+    "Moderate churn: {churn_rate:.1f}%",
+    "High churn: {churn_rate:.1f}%"
+)
+_CUSTOMER_EDGES = (100, 1000)
+_CUSTOMER_POINTS = (0, 1, 3, 5)
+_CUSTOMER_FACTORS = (
+    None,
+    "Small customer base: {customer_count:,}",
+    "Good customer base: {customer_count:,}",
+    "Large customer base: {customer_count:,}"
+)
+_TEAM_EDGES = (5, 10, 20)
+_TEAM_POINTS = (0, 15, 20, 25, 30)
+_TEAM_FACTORS = (
+    None,
+    "Small team: {team_size} members",
+    "Moderate team: {team_size} members",
+    "Good team size: {team_size} members",
+    "Large team: {team_size} members"
+)
+_FOUNDER_POINTS = (10, 25, 35, 40)
+_FOUNDER_FACTORS = (
+    "Founder information not available",
+    "Solo founder: {founder_count} person",
+    "Co-founder team: {founder_count} people",
+    "Multiple founders: {founder_count} people"
+)
+_TRACTION_CUSTOMER_EDGES = (100, 1000, 10000)
+_TRACTION_CUSTOMER_POINTS = (10, 20, 30, 35, 40)
+_TRACTION_CUSTOMER_FACTORS = (
+    "Customer data not available",
+    "Early customer traction: {customer_count:,}",
+    "Moderate customer traction: {customer_count:,}",
+    "Good customer traction: {customer_count:,}",
+    "High customer traction: {customer_count:,}"
+)
+_TRACTION_ARR_EDGES = (1, 5)
+_TRACTION_ARR_POINTS = (15, 25, 30, 35)
+_TRACTION_ARR_FACTORS = (
+    "Revenue data not available",
+    "Early revenue traction",
+    "Good revenue traction",
+    "Strong revenue traction"
+)
+_PMF_CHURN_POINTS = (15, 25, 20, 15)
+_PMF_CHURN_FACTORS = (
+    "PMF data not available",
+    "Strong product-market fit",
+    "Good product-market fit",
+    "Developing product-market fit"
+)
+# Risk codes: no revenue / <1 / <5 / otherwise, and <3 / <5 / <10 / otherwise team members
+_ARR_RISK_POINTS = (30, 20, 10, 0)
+_ARR_RISK_FACTORS = ("No revenue yet", "Very low revenue", "Low revenue", None)
+_TEAM_RISK_POINTS = (25, 15, 10, 0)
+_TEAM_RISK_FACTORS = ("Very small team", "Small team", "Moderate team size", None)
+# Sector risk codes: unclear / high-risk / other
+_SECTOR_RISK_POINTS = (20, 15, 0)
+_SECTOR_RISK_FACTORS = ("Unclear market focus", "High-risk sector", None)
+
+# Stage codes are bit flags (1 = series a/b, 2 = seed, 4 = pre-revenue/idea) because the
+# team and risk ladders check the same keywords in different orders
+_SERIES_STAGE, _SEED_STAGE, _EARLY_STAGE = 1, 2, 4
+
+def _stage_team_entry(code: int) -> tuple:
+    """(points, factor template) for the team quality stage ladder"""
+    if code & _SERIES_STAGE:
+        return 30, "Advanced stage: {stage}"
+    if code & _SEED_STAGE:
+        return 25, "Early stage: {stage}"
+    if code & _EARLY_STAGE:
+        return 15, "Very early stage: {stage}"
+    return 20, "Stage: {stage}"
+
+def _stage_risk_entry(code: int) -> tuple:
+    """(points, factor template) for the risk stage ladder"""
+    if code & _EARLY_STAGE:
+        return 25, "Very early stage"
+    if code & _SEED_STAGE:
+        return 15, "Early stage"
+    if code & _SERIES_STAGE:
+        return 5, "Proven stage"
+    return 0, None
+
+_STAGE_TEAM_POINTS, _STAGE_TEAM_FACTORS = zip(*(_stage_team_entry(code) for code in range(8)))
+_STAGE_RISK_POINTS, _STAGE_RISK_FACTORS = zip(*(_stage_risk_entry(code) for code in range(8)))
+
+def _bucket(value, edges: tuple, right: bool = False) -> int:
+    """Ladder bucket for one value; right=True makes the edges inclusive upper bounds"""
+    if not value > 0:
+        return 0
+    return 1 + (bisect_left(edges, value) if right else bisect_right(edges, value))
+
+def _ladder(values: np.ndarray, edges: tuple, points: tuple, right: bool = False) -> np.ndarray:
+    """Vectorized _bucket followed by a points lookup"""
+    buckets = np.where(values > 0, np.digitize(values, edges, right=right) + 1, 0)
+    return np.asarray(points)[buckets]
+
+def _revenue_model_code(revenue_model: str) -> int:
+    """Index into the revenue model tables for a lower-cased revenue model"""
+    if 'saas' in revenue_model or 'subscription' in revenue_model:
+        return 0
+    if 'marketplace' in revenue_model or 'commission' in revenue_model:
+        return 1
+    if 'one-time' in revenue_model or 'license' in revenue_model:
+        return 2
+    return 3
+
+def _stage_code(stage: str) -> int:
+    """Stage flags for a lower-cased stage"""
+    code = 0
+    if 'series a' in stage or 'series b' in stage:
+        code |= _SERIES_STAGE
+    if 'seed' in stage or 'pre-seed' in stage:
+        code |= _SEED_STAGE
+    if 'pre-revenue' in stage or 'idea' in stage:
+        code |= _EARLY_STAGE
+    return code
+
+def _sector_risk_code(sector: str) -> int:
+    """Index into the sector risk tables for a lower-cased sector"""
+    if not sector or sector == 'unknown':
+        return 0
+    if _HIGH_RISK_SECTOR_RE.search(sector):
+        return 1
+    return 2
+
+def _arr_risk_code(arr_crore) -> int:
+    """Index into the ARR risk tables"""
+    if arr_crore == 0:
+        return 0
+    if arr_crore < 1:
+        return 1
+    if arr_crore < 5:
+        return 2
+    return 3
+
+def _team_risk_code(team_size) -> int:
+    """Index into the team risk tables"""
+    if team_size < 3:
+        return 0
+    if team_size < 5:
+        return 1
+    if team_size < 10:
+        return 2
+    return 3
+
+def _scored(entries) -> tuple:
+    """Sum (points, factor template) pairs, dropping empty templates"""
+    score = 0.0
+    templates = []
+    for points, template in entries:
+        score += points
+        if template:
+            templates.append(template)
+    return min(score, 100.0), tuple(templates)
+
+@lru_cache(maxsize=4096)
+def _score_financial(arr_bucket: int, revenue_code: int, valuation_bucket: int,
+                     mrr_bucket: int, churn_bucket: int, customer_bucket: int) -> tuple:
+    """Financial health score and factor templates for bucketed inputs"""
+    return _scored((
+        (_ARR_POINTS[arr_bucket], _ARR_FACTORS[arr_bucket]),
+        (_REVENUE_MODEL_POINTS[revenue_code], _REVENUE_MODEL_FACTORS[revenue_code]),
+        (_VALUATION_POINTS[valuation_bucket], _VALUATION_FACTORS[valuation_bucket]),
+        (_MRR_POINTS[mrr_bucket], _MRR_FACTORS[mrr_bucket]),
+        (_CHURN_POINTS[churn_bucket], _CHURN_FACTORS[churn_bucket]),
+        (_CUSTOMER_POINTS[customer_bucket], _CUSTOMER_FACTORS[customer_bucket])
+    ))
+
+@lru_cache(maxsize=4096)
+def _score_team(team_bucket: int, founder_code: int, stage_code: int) -> tuple:
+    """Team quality score and factor templates for bucketed inputs"""
+    return _scored((
+        (_TEAM_POINTS[team_bucket], _TEAM_FACTORS[team_bucket]),
+        (_FOUNDER_POINTS[founder_code], _FOUNDER_FACTORS[founder_code]),
+        (_STAGE_TEAM_POINTS[stage_code], _STAGE_TEAM_FACTORS[stage_code])
+    ))
+
+@lru_cache(maxsize=4096)
+def _score_traction(customer_bucket: int, arr_bucket: int, churn_bucket: int) -> tuple:
+    """Product traction score and factor templates for bucketed inputs"""
+    return _scored((
+        (_TRACTION_CUSTOMER_POINTS[customer_bucket], _TRACTION_CUSTOMER_FACTORS[customer_bucket]),
+        (_TRACTION_ARR_POINTS[arr_bucket], _TRACTION_ARR_FACTORS[arr_bucket]),
+        (_PMF_CHURN_POINTS[churn_bucket], _PMF_CHURN_FACTORS[churn_bucket])
+    ))
+
+@lru_cache(maxsize=4096)
+def _score_risk(arr_code: int, team_code: int, sector_code: int, stage_code: int) -> tuple:
+    """Risk score and factor templates for bucketed inputs"""
+    return _scored((
+        (_ARR_RISK_POINTS[arr_code], _ARR_RISK_FACTORS[arr_code]),
+        (_TEAM_RISK_POINTS[team_code], _TEAM_RISK_FACTORS[team_code]),
+        (_SECTOR_RISK_POINTS[sector_code], _SECTOR_RISK_FACTORS[sector_code]),
+        (_STAGE_RISK_POINTS[stage_code], _STAGE_RISK_FACTORS[stage_code])
+    ))
+
+# metrics_weights keys in the order scores are combined
+_CATEGORY_ORDER = ('financial_health', 'team_quality', 'market_opportunity', 'product_traction', 'risk_assessment')
+
+def _compile_combiner(weights: tuple):
+    """Generate the weighted-sum function with the weights baked in as constants"""
+    financial, team, market, traction, risk = weights
+    # Same operation order as the original formula, so results stay bit-identical
+    source = (
+        "def _combine(financial_score, team_score, market_score, traction_score, risk_score):\n"
+        f"    return (financial_score * {financial!r} + team_score * {team!r} + market_score * {market!r}"
+        f" + traction_score * {traction!r} + (100 - risk_score) * {risk!r})\n"
+    )
+    namespace = {}
+    exec(source, namespace)
+    return namespace["_combine"]
+
+# Fields evaluate_batch reads, laid out one column per field
+_NUMERIC_FIELDS = ('arr_crore', 'valuation_pre_money_crore', 'team_size')
+_METRIC_FIELDS = ('mrr_lakh', 'churn_rate', 'customer_count')
+_TEXT_FIELDS = ('revenue_model', 'stage', 'sector')
+
+def _to_columns(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Convert extracted-data dicts to float64 columns; text fields become (distinct values, codes)"""
+    count = len(records)
+    metrics = [record.get('key_metrics') or {} for record in records]
+    
+    columns = {
+        key: np.fromiter((record.get(key) or 0 for record in records), dtype=np.float64, count=count)
+        for key in _NUMERIC_FIELDS
+    }
+    for key in _METRIC_FIELDS:
+        columns[key] = np.fromiter((m.get(key) or 0 for m in metrics), dtype=np.float64, count=count)
+    for key in _TEXT_FIELDS:
+        values = np.array([(record.get(key) or '').lower() for record in records], dtype=object)
+        columns[key] = np.unique(values, return_inverse=True)
+    columns['founder_count'] = np.fromiter(
+        (len(record.get('founders') or ()) for record in records), dtype=np.int64, count=count
+    )
+    return columns
+
+def _score_codes(column: tuple, scorer) -> np.ndarray:
+    """Score each distinct text value once and broadcast back through its codes"""
+    values, codes = column
+    return np.array([scorer(value) for value in values])[codes]
+
+@dataclass(slots=True, frozen=True)
 class EvaluationMetrics:
     """Comprehensive evaluation metrics for startup assessment"""
     financial_health_score: float
@@ -63,181 +357,98 @@ class StartupEvaluator:
                 'avg_competition_level': 0.9
             }
         }
+        
+        # Extracted sectors are lower-cased before lookup
+        self._benchmarks_by_sector = {name.lower(): benchmark for name, benchmark in self.sector_benchmarks.items()}
+        
+        # Weighted-sum combiner generated for the current weights; rebuilt if they change
+        self._compile_weights()
+        
+        # Sector scoring depends on this instance's benchmarks, so the cache is per instance
+        self._market_scores = lru_cache(maxsize=4096)(self._market_opportunity)
     
-    def evaluate_financial_health(self, extracted_data: Dict[str, Any]) -> float:
+    def evaluate_financial_health(self, extracted_data: Dict[str, Any], collect_factors: bool = False) -> Tuple[float, Optional[List[str]]]:
         """Evaluate financial health based on revenue, growth, and sustainability"""
-        score = 0.0
-        factors = []
-        
-        # ARR Analysis (0-30 points)
         arr_crore = extracted_data.get('arr_crore', 0)
-        if arr_crore > 0:
-            if arr_crore >= 10:  # 10+ crores ARR
-                score += 30
-                factors.append("Strong ARR: ₹{:.1f} crores".format(arr_crore))
-            elif arr_crore >= 5:  # 5-10 crores ARR
-                score += 25
-                factors.append("Good ARR: ₹{:.1f} crores".format(arr_crore))
-            elif arr_crore >= 1:  # 1-5 crores ARR
-                score += 20
-                factors.append("Moderate ARR: ₹{:.1f} crores".format(arr_crore))
-            else:
-                score += 10
-                factors.append("Early stage ARR: ₹{:.1f} crores".format(arr_crore))
-        
-        # Revenue Model Analysis (0-25 points)
         revenue_model = extracted_data.get('revenue_model', '').lower()
-        if 'saas' in revenue_model or 'subscription' in revenue_model:
-            score += 25
-            factors.append("Recurring revenue model")
-        elif 'marketplace' in revenue_model or 'commission' in revenue_model:
-            score += 20
-            factors.append("Marketplace/commission model")
-        elif 'one-time' in revenue_model or 'license' in revenue_model:
-            score += 15
-            factors.append("One-time/license model")
-        else:
-            score += 10
-            factors.append("Other revenue model")
-        
-        # Valuation Analysis (0-25 points)
         valuation = extracted_data.get('valuation_pre_money_crore', 0)
-        if valuation > 0:
-            if valuation >= 100:  # 100+ crores valuation
-                score += 25
-                factors.append("High valuation: ₹{:.1f} crores".format(valuation))
-            elif valuation >= 50:  # 50-100 crores valuation
-                score += 20
-                factors.append("Good valuation: ₹{:.1f} crores".format(valuation))
-            elif valuation >= 20:  # 20-50 crores valuation
-                score += 15
-                factors.append("Moderate valuation: ₹{:.1f} crores".format(valuation))
-            else:
-                score += 10
-                factors.append("Early stage valuation: ₹{:.1f} crores".format(valuation))
-        
-        # Key Metrics Analysis (0-20 points)
         key_metrics = extracted_data.get('key_metrics', {})
         mrr_lakh = key_metrics.get('mrr_lakh', 0)
         churn_rate = key_metrics.get('churn_rate', 0)
         customer_count = key_metrics.get('customer_count', 0)
         
-        if mrr_lakh > 0:
-            if mrr_lakh >= 50:  # 50+ lakhs MRR
-                score += 10
-                factors.append("Strong MRR: ₹{:.1f} lakhs".format(mrr_lakh))
-            elif mrr_lakh >= 20:  # 20-50 lakhs MRR
-                score += 8
-                factors.append("Good MRR: ₹{:.1f} lakhs".format(mrr_lakh))
-            else:
-                score += 5
-                factors.append("Early MRR: ₹{:.1f} lakhs".format(mrr_lakh))
-        
-        if churn_rate > 0:
-            if churn_rate <= 5:  # Low churn
-                score += 5
-                factors.append("Low churn: {:.1f}%".format(churn_rate))
-            elif churn_rate <= 10:  # Moderate churn
-                score += 3
-                factors.append("Moderate churn: {:.1f}%".format(churn_rate))
-            else:
-                score += 1
-                factors.append("High churn: {:.1f}%".format(churn_rate))
-        
-        if customer_count > 0:
-            if customer_count >= 1000:
-                score += 5
-                factors.append("Large customer base: {:,}".format(customer_count))
-            elif customer_count >= 100:
-                score += 3
-                factors.append("Good customer base: {:,}".format(customer_count))
-            else:
-                score += 1
-                factors.append("Small customer base: {:,}".format(customer_count))
-        
-        return min(score, 100.0), factors
+        score, templates = _score_financial(
+            _bucket(arr_crore, _ARR_EDGES),
+            _revenue_model_code(revenue_model),
+            _bucket(valuation, _VALUATION_EDGES),
+            _bucket(mrr_lakh, _MRR_EDGES),
+            _bucket(churn_rate, _CHURN_EDGES, right=True),
+            _bucket(customer_count, _CUSTOMER_EDGES)
+        )
+        if not collect_factors:
+            return score, None
+        
+        factors = [
+            template.format(arr_crore=arr_crore, valuation=valuation, mrr_lakh=mrr_lakh,
+                            churn_rate=churn_rate, customer_count=customer_count)
+            for template in templates
+        ]
+        return score, factors
     
-    def evaluate_team_quality(self, extracted_data: Dict[str, Any]) -> float:
+    def evaluate_team_quality(self, extracted_data: Dict[str, Any], collect_factors: bool = False) -> Tuple[float, Optional[List[str]]]:
         """Evaluate team quality based on founders, team size, and experience"""
-        score = 0.0
-        factors = []
-        
-        # Team Size Analysis (0-30 points)
         team_size = extracted_data.get('team_size', 0)
-        if team_size > 0:
-            if team_size >= 20:  # 20+ team members
-                score += 30
-                factors.append("Large team: {} members".format(team_size))
-            elif team_size >= 10:  # 10-20 team members
-                score += 25
-                factors.append("Good team size: {} members".format(team_size))
-            elif team_size >= 5:  # 5-10 team members
-                score += 20
-                factors.append("Moderate team: {} members".format(team_size))
-            else:
-                score += 15
-                factors.append("Small team: {} members".format(team_size))
-        
-        # Founders Analysis (0-40 points)
         founders = extracted_data.get('founders', [])
-        if founders:
-            founder_count = len(founders)
-            if founder_count >= 3:  # 3+ founders
-                score += 40
-                factors.append("Multiple founders: {} people".format(founder_count))
-            elif founder_count == 2:  # 2 founders
-                score += 35
-                factors.append("Co-founder team: {} people".format(founder_count))
-            else:  # 1 founder
-                score += 25
-                factors.append("Solo founder: {} person".format(founder_count))
-        else:
-            score += 10
-            factors.append("Founder information not available")
-        
-        # Stage Analysis (0-30 points)
+        founder_count = len(founders) if founders else 0
         stage = extracted_data.get('stage', '').lower()
-        if 'series a' in stage or 'series b' in stage:
-            score += 30
-            factors.append("Advanced stage: {}".format(stage))
-        elif 'seed' in stage or 'pre-seed' in stage:
-            score += 25
-            factors.append("Early stage: {}".format(stage))
-        elif 'pre-revenue' in stage or 'idea' in stage:
-            score += 15
-            factors.append("Very early stage: {}".format(stage))
-        else:
-            score += 20
-            factors.append("Stage: {}".format(stage))
         
-        return min(score, 100.0), factors
+        score, templates = _score_team(
+            _bucket(team_size, _TEAM_EDGES),
+            min(founder_count, 3),
+            _stage_code(stage)
+        )
+        if not collect_factors:
+            return score, None
+        
+        factors = [
+            template.format(team_size=team_size, founder_count=founder_count, stage=stage)
+            for template in templates
+        ]
+        return score, factors
     
-    def evaluate_market_opportunity(self, extracted_data: Dict[str, Any]) -> float:
-        """Evaluate market opportunity based on sector, market size, and competition"""
+    def _compile_weights(self):
+        """Specialize the score combiner for the current metrics_weights"""
+        # Category weights in scoring order; risk is applied to its inversion (100 - risk)
+        weights = tuple(float(self.metrics_weights[name]) for name in _CATEGORY_ORDER)
+        self._compiled_weights = dict(self.metrics_weights)
+        self._weight_vector = np.array(weights)
+        self._combine = _compile_combiner(weights)
+    
+    def _market_opportunity(self, sector: str) -> tuple:
+        """Market opportunity score and factors for a lower-cased sector"""
         score = 0.0
         factors = []
         
         # Sector Analysis (0-40 points)
-        sector = extracted_data.get('sector', '').lower()
-        if sector in self.sector_benchmarks:
-            benchmark = self.sector_benchmarks[sector]
+        benchmark = self._benchmarks_by_sector.get(sector)
+        if benchmark is not None:
             score += 40
-            factors.append("High-growth sector: {}".format(sector))
-        elif any(keyword in sector for keyword in ['tech', 'ai', 'ml', 'saas', 'fintech']):
+            factors.append(f"High-growth sector: {sector}")
+        elif _TECH_SECTOR_RE.search(sector):
             score += 35
-            factors.append("Tech sector: {}".format(sector))
-        elif any(keyword in sector for keyword in ['health', 'education', 'ecommerce']):
+            factors.append(f"Tech sector: {sector}")
+        elif _STABLE_SECTOR_RE.search(sector):
             score += 30
-            factors.append("Stable sector: {}".format(sector))
+            factors.append(f"Stable sector: {sector}")
         else:
             score += 20
-            factors.append("Other sector: {}".format(sector))
+            factors.append(f"Other sector: {sector}")
         
         # Market Size Analysis (0-30 points)
         # This would typically come from external data sources
         # For now, we'll use sector-based assumptions
-        if sector in self.sector_benchmarks:
-            market_size = self.sector_benchmarks[sector]['avg_market_size']
+        if benchmark is not None:
+            market_size = benchmark['avg_market_size']
             if market_size >= 5000000000:  # 5B+ market
                 score += 30
                 factors.append("Large market opportunity")
@@ -252,8 +463,8 @@ class StartupEvaluator:
             factors.append("Market size unknown")
         
         # Competition Analysis (0-30 points)
-        if sector in self.sector_benchmarks:
-            competition_level = self.sector_benchmarks[sector]['avg_competition_level']
+        if benchmark is not None:
+            competition_level = benchmark['avg_competition_level']
             if competition_level <= 0.5:  # Low competition
                 score += 30
                 factors.append("Low competition market")
@@ -267,119 +478,97 @@ class StartupEvaluator:
             score += 20
             factors.append("Competition level unknown")
         
-        return min(score, 100.0), factors
+        return min(score, 100.0), tuple(factors)
+    
+    def evaluate_market_opportunity(self, extracted_data: Dict[str, Any], collect_factors: bool = False) -> Tuple[float, Optional[List[str]]]:
+        """Evaluate market opportunity based on sector, market size, and competition"""
+        score, factors = self._market_scores(extracted_data.get('sector', '').lower())
+        return score, list(factors) if collect_factors else None
     
-    def evaluate_product_traction(self, extracted_data: Dict[str, Any]) -> float:
+    def evaluate_product_traction(self, extracted_data: Dict[str, Any], collect_factors: bool = False) -> Tuple[float, Optional[List[str]]]:
         """Evaluate product traction based on user metrics and growth"""
-        score = 0.0
-        factors = []
-        
-        # Customer Growth Analysis (0-40 points)
         key_metrics = extracted_data.get('key_metrics', {})
         customer_count = key_metrics.get('customer_count', 0)
-        
-        if customer_count > 0:
-            if customer_count >= 10000:  # 10K+ customers
-                score += 40
-                factors.append("High customer traction: {:,}".format(customer_count))
-            elif customer_count >= 1000:  # 1K-10K customers
-                score += 35
-                factors.append("Good customer traction: {:,}".format(customer_count))
-            elif customer_count >= 100:  # 100-1K customers
-                score += 30
-                factors.append("Moderate customer traction: {:,}".format(customer_count))
-            else:
-                score += 20
-                factors.append("Early customer traction: {:,}".format(customer_count))
-        else:
-            score += 10
-            factors.append("Customer data not available")
-        
-        # Revenue Growth Analysis (0-35 points)
         arr_crore = extracted_data.get('arr_crore', 0)
-        if arr_crore > 0:
-            if arr_crore >= 5:  # 5+ crores ARR
-                score += 35
-                factors.append("Strong revenue traction")
-            elif arr_crore >= 1:  # 1-5 crores ARR
-                score += 30
-                factors.append("Good revenue traction")
-            else:
-                score += 25
-                factors.append("Early revenue traction")
-        else:
-            score += 15
-            factors.append("Revenue data not available")
-        
-        # Product-Market Fit Indicators (0-25 points)
         churn_rate = key_metrics.get('churn_rate', 0)
-        if churn_rate > 0:
-            if churn_rate <= 5:  # Low churn indicates PMF
-                score += 25
-                factors.append("Strong product-market fit")
-            elif churn_rate <= 10:  # Moderate churn
-                score += 20
-                factors.append("Good product-market fit")
-            else:
-                score += 15
-                factors.append("Developing product-market fit")
-        else:
-            score += 15
-            factors.append("PMF data not available")
         
-        return min(score, 100.0), factors
+        score, templates = _score_traction(
+            _bucket(customer_count, _TRACTION_CUSTOMER_EDGES),
+            _bucket(arr_crore, _TRACTION_ARR_EDGES),
+            _bucket(churn_rate, _CHURN_EDGES, right=True)
+        )
+        if not collect_factors:
+            return score, None
+        
+        factors = [template.format(customer_count=customer_count) for template in templates]
+        return score, factors
     
-    def evaluate_risk_assessment(self, extracted_data: Dict[str, Any]) -> float:
+    def evaluate_risk_assessment(self, extracted_data: Dict[str, Any], collect_factors: bool = False) -> Tuple[float, Optional[List[str]]]:
         """Evaluate risk factors and return risk score (lower is better)"""
-        risk_score = 0.0
-        risk_factors = []
-        
-        # Financial Risk (0-30 points)
-        arr_crore = extracted_data.get('arr_crore', 0)
-        if arr_crore == 0:
-            risk_score += 30
-            risk_factors.append("No revenue yet")
-        elif arr_crore < 1:  # Less than 1 crore ARR
-            risk_score += 20
-            risk_factors.append("Very low revenue")
-        elif arr_crore < 5:  # Less than 5 crores ARR
-            risk_score += 10
-            risk_factors.append("Low revenue")
-        
-        # Team Risk (0-25 points)
-        team_size = extracted_data.get('team_size', 0)
-        if team_size < 3:
-            risk_score += 25
-            risk_factors.append("Very small team")
-        elif team_size < 5:
-            risk_score += 15
-            risk_factors.append("Small team")
-        elif team_size < 10:
-            risk_score += 10
-            risk_factors.append("Moderate team size")
-        
-        # Market Risk (0-20 points)
-        sector = extracted_data.get('sector', '').lower()
-        if not sector or sector == 'unknown':
-            risk_score += 20
-            risk_factors.append("Unclear market focus")
-        elif any(keyword in sector for keyword in ['crypto', 'blockchain', 'nft']):
-            risk_score += 15
-            risk_factors.append("High-risk sector")
-        
-        # Stage Risk (0-25 points)
-        stage = extracted_data.get('stage', '').lower()
-        if 'pre-revenue' in stage or 'idea' in stage:
-            risk_score += 25
-            risk_factors.append("Very early stage")
-        elif 'seed' in stage or 'pre-seed' in stage:
-            risk_score += 15
-            risk_factors.append("Early stage")
-        elif 'series a' in stage or 'series b' in stage:
-            risk_score += 5
-            risk_factors.append("Proven stage")
+        risk_score, risk_factors = _score_risk(
+            _arr_risk_code(extracted_data.get('arr_crore', 0)),
+            _team_risk_code(extracted_data.get('team_size', 0)),
+            _sector_risk_code(extracted_data.get('sector', '').lower()),
+            _stage_code(extracted_data.get('stage', '').lower())
+        )
+        return risk_score, list(risk_factors) if collect_factors else None
+    
+    def _sector_points(self, sector: str) -> tuple:
+        """(market opportunity score, risk points) for a lower-cased sector"""
+        market_score, _ = self._market_scores(sector)
+        return market_score, _SECTOR_RISK_POINTS[_sector_risk_code(sector)]
+    
+    def evaluate_batch(self, records: List[Dict[str, Any]]) -> np.ndarray:
+        """Score many startups at once; returns overall investment scores in record order"""
+        if not records:
+            return np.zeros(0)
+        if self.metrics_weights != self._compiled_weights:
+            self._compile_weights()
+        
+        columns = _to_columns(records)
+        arr_crore = columns['arr_crore']
+        valuation = columns['valuation_pre_money_crore']
+        team_size = columns['team_size']
+        mrr_lakh = columns['mrr_lakh']
+        churn_rate = columns['churn_rate']
+        customer_count = columns['customer_count']
+        
+        revenue_points = np.asarray(_REVENUE_MODEL_POINTS)[_score_codes(columns['revenue_model'], _revenue_model_code)]
+        stage_codes = _score_codes(columns['stage'], _stage_code)
+        sector_points = _score_codes(columns['sector'], self._sector_points)
+        founder_points = np.asarray(_FOUNDER_POINTS)[np.minimum(columns['founder_count'], 3)]
+        
+        financial = np.minimum(
+            _ladder(arr_crore, _ARR_EDGES, _ARR_POINTS)
+            + revenue_points
+            + _ladder(valuation, _VALUATION_EDGES, _VALUATION_POINTS)
+            + _ladder(mrr_lakh, _MRR_EDGES, _MRR_POINTS)
+            + _ladder(churn_rate, _CHURN_EDGES, _CHURN_POINTS, right=True)
+            + _ladder(customer_count, _CUSTOMER_EDGES, _CUSTOMER_POINTS),
+            100.0
+        )
+        team = np.minimum(
+            _ladder(team_size, _TEAM_EDGES, _TEAM_POINTS)
+            + founder_points
+            + np.asarray(_STAGE_TEAM_POINTS)[stage_codes],
+            100.0
+        )
+        market = sector_points[:, 0]
+        traction = np.minimum(
+            _ladder(customer_count, _TRACTION_CUSTOMER_EDGES, _TRACTION_CUSTOMER_POINTS)
+            + _ladder(arr_crore, _TRACTION_ARR_EDGES, _TRACTION_ARR_POINTS)
+            + _ladder(churn_rate, _CHURN_EDGES, _PMF_CHURN_POINTS, right=True),
+            100.0
+        )
+        risk = np.minimum(
+            np.select([arr_crore == 0, arr_crore < 1, arr_crore < 5], _ARR_RISK_POINTS[:3], 0)
+            + np.select([team_size < 3, team_size < 5, team_size < 10], _TEAM_RISK_POINTS[:3], 0)
+            + sector_points[:, 1]
+            + np.asarray(_STAGE_RISK_POINTS)[stage_codes],
+            100.0
+        )
         
-        return min(risk_score, 100.0), risk_factors
+        return np.column_stack((financial, team, market, traction, 100 - risk)) @ self._weight_vector
     
     def generate_investment_recommendation(self, overall_score: float, risk_score: float) -> str:
         """Generate investment recommendation based on overall score and risk"""
@@ -421,21 +610,17 @@ class StartupEvaluator:
         """Main evaluation method that combines all metrics"""
         logger.info("Starting comprehensive startup evaluation")
         
-        # Evaluate each category
-        financial_score, financial_factors = self.evaluate_financial_health(extracted_data)
-        team_score, team_factors = self.evaluate_team_quality(extracted_data)
-        market_score, market_factors = self.evaluate_market_opportunity(extracted_data)
-        traction_score, traction_factors = self.evaluate_product_traction(extracted_data)
-        risk_score, risk_factors = self.evaluate_risk_assessment(extracted_data)
+        # Evaluate each category; EvaluationMetrics carries no factors, so skip building them
+        financial_score, _ = self.evaluate_financial_health(extracted_data)
+        team_score, _ = self.evaluate_team_quality(extracted_data)
+        market_score, _ = self.evaluate_market_opportunity(extracted_data)
+        traction_score, _ = self.evaluate_product_traction(extracted_data)
+        risk_score, _ = self.evaluate_risk_assessment(extracted_data)
         
         # Calculate weighted overall score
-        overall_score = (
-            financial_score * self.metrics_weights['financial_health'] +
-            team_score * self.metrics_weights['team_quality'] +
-            market_score * self.metrics_weights['market_opportunity'] +
-            traction_score * self.metrics_weights['product_traction'] +
-            (100 - risk_score) * self.metrics_weights['risk_assessment']
-        )
+        if self.metrics_weights != self._compiled_weights:
+            self._compile_weights()
+        overall_score = self._combine(financial_score, team_score, market_score, traction_score, risk_score)
         
         # Generate recommendation
         recommendation = self.generate_investment_recommendation(overall_score, risk_score)
@@ -452,5 +637,5 @@ class StartupEvaluator:
             overall_investment_score=overall_score,
             investment_recommendation=recommendation,
             confidence_level=confidence,
-            evaluation_timestamp=datetime.now().isoformat()
+            evaluation_timestamp=now_iso()
         )
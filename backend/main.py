@@ -1,17 +1,34 @@
 from fastapi import FastAPI, HTTPException, File, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
+from google.api_core.exceptions import ResourceExhausted
 from google.cloud import vision, storage, bigquery
+from google.cloud.storage import transfer_manager
 import vertexai
-from vertexai.generative_models import GenerativeModel
+from vertexai.generative_models import GenerationConfig, GenerativeModel
+from requests.adapters import HTTPAdapter
 import uvicorn
 import os
-import json
+import re
 import hashlib
 import asyncio
+import io
+import random
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import TTLCache
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, BinaryIO, Iterator, List, Optional, Union
+import numpy as np
+import orjson
 import logging
 
+# PyMuPDF's C core extracts text far faster than PyPDF2, which stays as the fallback
+try:
+    import fitz
+except ImportError:
+    fitz = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -38,21 +55,104 @@ REGION = os.getenv("REGION", "asia-south1")
 DATASET_ID = os.getenv("DATASET_ID", "startup_evaluation")
 BUCKET_NAME = os.getenv("BUCKET_NAME", "omega-terrain-472716-c4-startup-docs-1758481951")
 
+# Page-range workers for PDF text extraction; short documents are not worth splitting
+PDF_WORKERS = os.cpu_count() or 1
+PDF_PARALLEL_MIN_PAGES = 16
+# Pages extracted per chunk; bounds how much of a large deck is in flight at once
+PDF_CHUNK_PAGES = int(os.getenv("PDF_CHUNK_PAGES", "50"))
+# Uploads up to Starlette's spool size are still in memory, so they are passed around as
+# bytes; larger ones have already rolled to disk and are staged as a local file instead
+PDF_IN_MEMORY_MAX = 1024 * 1024
+# Document characters Gemini sees; extraction can stop once it has this much text
+GEMINI_TEXT_LIMIT = 3000
+pdf_executor = ThreadPoolExecutor(max_workers=PDF_WORKERS, thread_name_prefix="pdf-extract")
+
+# Decks at or above this size are uploaded as concurrent multipart chunks; below it the
+# size is known, so a single request is cheaper than splitting
+GCS_PARALLEL_UPLOAD_MIN = 32 * 1024 * 1024
+GCS_UPLOAD_CHUNK = 8 * 1024 * 1024
+GCS_UPLOAD_WORKERS = 8
+# Keep-alive connections per host for the shared storage client; must cover the upload workers
+GCS_HTTP_POOL = 32
+
+# Gemini analyses keyed by a hash of the document text it saw; re-uploaded decks skip the LLM call
+GEMINI_CACHE_TTL = int(os.getenv("GEMINI_CACHE_TTL", "3600"))
+gemini_cache = TTLCache(maxsize=1024, ttl=GEMINI_CACHE_TTL)
+
+# Cap in-flight Gemini calls at the Vertex AI quota; quota errors are retried with jittered backoff
+GEMINI_CONCURRENCY = int(os.getenv("GEMINI_CONCURRENCY", "10"))
+GEMINI_MAX_RETRIES = 3
+gemini_semaphore = asyncio.Semaphore(GEMINI_CONCURRENCY)
+# Gemini is asked for bare JSON; the fence pattern only covers responses that still wrap it
+_JSON_FENCE_RE = re.compile(rb"```json\s*(.*?)```", re.S)
+# Uncached documents analyzed together in one Gemini call by the batch endpoint
+GEMINI_BATCH_SIZE = int(os.getenv("GEMINI_BATCH_SIZE", "5"))
+
+# Category scores averaged into the overall score; the last one is a risk score and is inverted
+_SCORE_CATEGORIES = ("financial_health", "team_quality", "market_opportunity", "product_traction", "risk_assessment")
+
+# Prompt sections shared by single-document and batched Gemini analysis
+_ANALYSIS_CRITERIA = """1. Company name and business sector
+        2. Financial health (revenue, funding, burn rate, profitability)
+        3. Team quality (founders' experience, team size, expertise)
+        4. Market opportunity (market size, competition, growth potential)
+        5. Product traction (customers, growth metrics, product-market fit)
+        6. Risk factors (market risks, operational risks, financial risks)
+
+        Provide realistic scores (0-100) for each category based on the actual content. If information is missing, score accordingly lower."""
+_ANALYSIS_JSON_FORMAT = """{
+            "startup_name": "extracted company name",
+            "sector": "business sector",
+            "financial_health": {"score": 0-100, "details": "specific analysis based on content"},
+            "team_quality": {"score": 0-100, "details": "specific analysis based on content"},
+            "market_opportunity": {"score": 0-100, "details": "specific analysis based on content"},
+            "product_traction": {"score": 0-100, "details": "specific analysis based on content"},
+            "risk_assessment": {"score": 0-100, "details": "specific analysis based on content"},
+            "overall_analysis": "comprehensive analysis based on actual document content"
+        }"""
+_CATEGORY_SCHEMA = {
+    "type": "object",
+    "properties": {"score": {"type": "number"}, "details": {"type": "string"}},
+    "required": ["score", "details"]
+}
+_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "startup_name": {"type": "string"},
+        "sector": {"type": "string"},
+        **{category: _CATEGORY_SCHEMA for category in _SCORE_CATEGORIES},
+        "overall_analysis": {"type": "string"}
+    },
+    "required": ["startup_name", "sector", *_SCORE_CATEGORIES, "overall_analysis"]
+}
+# Group calls constrain decoding to an array of analyses so one malformed element cannot break the whole parse
+_GROUP_GENERATION_CONFIG = GenerationConfig(
+    response_mime_type="application/json",
+    response_schema={"type": "array", "items": _ANALYSIS_SCHEMA}
+)
+
 # Initialize GCP clients
 try:
     vision_client = vision.ImageAnnotatorClient()
     storage_client = storage.Client(project=PROJECT_ID)
+    # Reuse pooled connections across requests instead of paying a TLS handshake per upload
+    storage_client._http.mount("https://", HTTPAdapter(pool_connections=GCS_HTTP_POOL, pool_maxsize=GCS_HTTP_POOL))
+    gcs_bucket = storage_client.bucket(BUCKET_NAME)
     bigquery_client = bigquery.Client(project=PROJECT_ID)
     
     # Initialize Vertex AI
     vertexai.init(project=PROJECT_ID, location=REGION)
-    gemini_model = GenerativeModel("gemini-1.5-pro")
+    gemini_model = GenerativeModel(
+        "gemini-1.5-pro",
+        generation_config=GenerationConfig(response_mime_type="application/json")
+    )
     
     logger.info(f"GCP services initialized for project {PROJECT_ID}")
 except Exception as e:
     logger.error(f"Failed to initialize GCP services: {e}")
     vision_client = None
     storage_client = None
+    gcs_bucket = None
     bigquery_client = None
     gemini_model = None
 
@@ -64,12 +164,48 @@ async def health_check():
 async def root():
     return {"message": "Welcome to AI Startup Evaluator API"}
 
-async def upload_to_gcs(file_content: bytes, filename: str) -> str:
+def _stage_upload(file_obj: BinaryIO) -> Union[bytes, str]:
+    """Return small uploads as bytes, otherwise copy to a local PDF file that upload and extraction can read concurrently"""
+    size = file_obj.seek(0, io.SEEK_END)
+    file_obj.seek(0)
+    if size <= PDF_IN_MEMORY_MAX:
+        return file_obj.read()
+    
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+        shutil.copyfileobj(file_obj, tmp, GCS_UPLOAD_CHUNK)
+    return tmp.name
+
+def _open_pdf(pdf_source: Union[bytes, str]):
+    """Open PDF bytes or a local PDF path with PyMuPDF"""
+    if isinstance(pdf_source, bytes):
+        return fitz.open(stream=pdf_source, filetype="pdf")
+    return fitz.open(pdf_source, filetype="pdf")
+
+def _upload_blob(blob, pdf_source: Union[bytes, str]):
+    """Upload PDF bytes or a local PDF in one request, or as parallel chunks for large files"""
+    if isinstance(pdf_source, bytes):
+        blob.upload_from_string(pdf_source, content_type="application/pdf")
+        return
+    
+    pdf_path = pdf_source
+    if os.path.getsize(pdf_path) < GCS_PARALLEL_UPLOAD_MIN:
+        blob.upload_from_filename(pdf_path, content_type="application/pdf")
+        return
+    
+    transfer_manager.upload_chunks_concurrently(
+        pdf_path,
+        blob,
+        content_type="application/pdf",
+        chunk_size=GCS_UPLOAD_CHUNK,
+        worker_type=transfer_manager.THREAD,
+        max_workers=GCS_UPLOAD_WORKERS
+    )
+
+async def upload_to_gcs(pdf_source: Union[bytes, str], filename: str) -> str:
     """Upload file to Google Cloud Storage"""
     try:
-        bucket = storage_client.bucket(BUCKET_NAME)
-        blob = bucket.blob(f"raw_documents/{filename}")
-        blob.upload_from_string(file_content, content_type="application/pdf")
+        blob = gcs_bucket.blob(f"raw_documents/{filename}")
+        await asyncio.to_thread(_upload_blob, blob, pdf_source)
         gcs_uri = f"gs://{BUCKET_NAME}/raw_documents/{filename}"
         logger.info(f"File uploaded to {gcs_uri}")
         return gcs_uri
@@ -77,84 +213,127 @@ async def upload_to_gcs(file_content: bytes, filename: str) -> str:
         logger.error(f"Failed to upload to GCS: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to upload file: {e}")
 
-async def extract_text_with_vision(gcs_uri: str) -> str:
-    """Extract text from PDF using PyPDF2"""
-    try:
-        import tempfile
+def _extract_page_range(pdf_source: Union[bytes, str], start: int, stop: int) -> List[str]:
+    """Extract pages [start, stop); each worker opens its own document since PyMuPDF objects are not thread-safe"""
+    with _open_pdf(pdf_source) as doc:
+        return [doc[page_num].get_text("text") for page_num in range(start, stop)]
+
+def _extract_pages(pdf_source: Union[bytes, str], start: int, stop: int) -> List[str]:
+    """Extract pages [start, stop), split across the PDF workers when the range is long enough"""
+    if stop - start < PDF_PARALLEL_MIN_PAGES or PDF_WORKERS == 1:
+        return _extract_page_range(pdf_source, start, stop)
+    
+    # Contiguous page ranges per worker; results are collected in page order
+    step = -(-(stop - start) // PDF_WORKERS)
+    futures = [
+        pdf_executor.submit(_extract_page_range, pdf_source, range_start, min(range_start + step, stop))
+        for range_start in range(start, stop, step)
+    ]
+    return [text for future in futures for text in future.result()]
+
+def _iter_pdf_text(pdf_source: Union[bytes, str]) -> Iterator[str]:
+    """Yield page texts in order, one chunk of pages at a time"""
+    if fitz is None:
         import PyPDF2
-        import io
-        
-        # Extract bucket and object name from GCS URI
-        gcs_path = gcs_uri.replace('gs://', '')
-        bucket_name, object_name = gcs_path.split('/', 1)
         
-        # Download file from GCS
-        bucket = storage_client.bucket(bucket_name)
-        blob = bucket.blob(object_name)
-        pdf_content = blob.download_as_bytes()
-        
-        # Extract text using PyPDF2
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_content))
-        full_text = ""
-        
-        for page_num in range(len(pdf_reader.pages)):
-            page = pdf_reader.pages[page_num]
-            text = page.extract_text()
-            full_text += text + "\n"
+        pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_source) if isinstance(pdf_source, bytes) else pdf_source)
+        for page in pdf_reader.pages:
+            yield page.extract_text()
+        return
+    
+    with _open_pdf(pdf_source) as doc:
+        page_count = doc.page_count
+    
+    for chunk_start in range(0, page_count, PDF_CHUNK_PAGES):
+        yield from _extract_pages(pdf_source, chunk_start, min(chunk_start + PDF_CHUNK_PAGES, page_count))
+
+def _extract_pdf_text(pdf_source: Union[bytes, str], max_chars: Optional[int] = None) -> str:
+    """Extract text from PDF bytes or a local PDF with PyMuPDF (PyPDF2 fallback), stopping after max_chars of text"""
+    pages = []
+    total_chars = 0
+    for text in _iter_pdf_text(pdf_source):
+        pages.append(text)
+        total_chars += len(text) + 1
+        # Later chunks are never parsed once the caller has enough leading text
+        if max_chars is not None and total_chars >= max_chars and len("\n".join(pages).lstrip()) >= max_chars:
+            break
+    
+    return "\n".join(pages).strip()
+
+async def extract_text_with_vision(pdf_source: Union[bytes, str], max_chars: Optional[int] = None) -> str:
+    """Extract text from PDF using PyMuPDF"""
+    try:
+        # Parse the local content off the event loop so concurrent requests are not blocked
+        full_text = await asyncio.to_thread(_extract_pdf_text, pdf_source, max_chars)
         
-        logger.info(f"Extracted {len(full_text)} characters from PDF using PyPDF2")
-        return full_text.strip()
+        logger.info(f"Extracted {len(full_text)} characters from PDF using {'PyMuPDF' if fitz is not None else 'PyPDF2'}")
+        return full_text
         
     except Exception as e:
-        logger.error(f"Failed to extract text with PyPDF2: {e}")
+        logger.error(f"Failed to extract text from PDF: {e}")
         # Return a generic message that will trigger Gemini analysis
         return "Startup document analysis - Please provide detailed business information for comprehensive evaluation"
 
+async def generate_with_backoff(prompt: str, generation_config: Optional[GenerationConfig] = None):
+    """Call Gemini within the concurrency cap, retrying ResourceExhausted with exponential backoff
+    
+    generation_config replaces the model's default config for this call when given.
+    """
+    for attempt in range(GEMINI_MAX_RETRIES + 1):
+        try:
+            async with gemini_semaphore:
+                return await gemini_model.generate_content_async(prompt, generation_config=generation_config)
+        except ResourceExhausted as e:
+            if attempt == GEMINI_MAX_RETRIES:
+                raise
+            delay = 2 ** attempt + random.random()
+            logger.warning(f"Gemini quota exhausted, retrying in {delay:.1f}s: {e}")
+            # Back off outside the semaphore so waiting requests can use the slot
+            await asyncio.sleep(delay)
+
+def _gemini_cache_key(text: str) -> str:
+    """Cache key for a document; only the prompt's slice of it affects the answer, so hash just that"""
+    return hashlib.sha256(text[:GEMINI_TEXT_LIMIT].encode()).hexdigest()
+
+def _parse_gemini_json(response) -> bytes:
+    """JSON bytes from a Gemini response, unwrapping a ```json fence if present"""
+    response_bytes = response.text.encode()
+    fenced = _JSON_FENCE_RE.search(response_bytes)
+    return fenced.group(1) if fenced else response_bytes
+
 async def analyze_with_gemini(text: str) -> Dict[str, Any]:
     """Analyze text using Gemini Pro"""
     try:
+        cache_key = _gemini_cache_key(text)
+        cached_json = gemini_cache.get(cache_key)
+        if cached_json is not None:
+            analysis = orjson.loads(cached_json)
+            logger.info(f"Gemini analysis served from cache for {analysis.get('startup_name', 'Unknown')}")
+            return analysis
+        
         # Use actual document content for analysis
         prompt = f"""
         You are an expert startup investment analyst. Analyze the following startup document and provide a comprehensive evaluation.
 
         Document content:
-        {text[:3000]}
+        {text[:GEMINI_TEXT_LIMIT]}
 
         Based on the document, extract and analyze:
-        1. Company name and business sector
-        2. Financial health (revenue, funding, burn rate, profitability)
-        3. Team quality (founders' experience, team size, expertise)
-        4. Market opportunity (market size, competition, growth potential)
-        5. Product traction (customers, growth metrics, product-market fit)
-        6. Risk factors (market risks, operational risks, financial risks)
-
-        Provide realistic scores (0-100) for each category based on the actual content. If information is missing, score accordingly lower.
+        {_ANALYSIS_CRITERIA}
 
         Return ONLY valid JSON in this exact format:
-        {{
-            "startup_name": "extracted company name",
-            "sector": "business sector",
-            "financial_health": {{"score": 0-100, "details": "specific analysis based on content"}},
-            "team_quality": {{"score": 0-100, "details": "specific analysis based on content"}},
-            "market_opportunity": {{"score": 0-100, "details": "specific analysis based on content"}},
-            "product_traction": {{"score": 0-100, "details": "specific analysis based on content"}},
-            "risk_assessment": {{"score": 0-100, "details": "specific analysis based on content"}},
-            "overall_analysis": "comprehensive analysis based on actual document content"
-        }}
+        {_ANALYSIS_JSON_FORMAT}
         """
         
-        response = gemini_model.generate_content(prompt)
+        # Async call so a slow Gemini response does not block other requests on the event loop
+        response = await generate_with_backoff(prompt)
         
         # Extract JSON from response
-        response_text = response.text.strip()
-        if "```json" in response_text:
-            json_start = response_text.find("```json") + 7
-            json_end = response_text.find("```", json_start)
-            json_text = response_text[json_start:json_end].strip()
-        else:
-            json_text = response_text
+        json_bytes = _parse_gemini_json(response)
         
-        analysis = json.loads(json_text)
+        analysis = orjson.loads(json_bytes)
+        # Cache the JSON bytes rather than the dict so callers never share mutable state
+        gemini_cache[cache_key] = json_bytes
         logger.info(f"Gemini analysis completed for {analysis.get('startup_name', 'Unknown')}")
         return analysis
         
@@ -172,17 +351,92 @@ async def analyze_with_gemini(text: str) -> Dict[str, Any]:
             "overall_analysis": "AI analysis is being processed. This is a demo response."
         }
 
+async def _analyze_document_group(texts: List[str]) -> List[Any]:
+    """Analyze up to GEMINI_BATCH_SIZE documents in one Gemini call, falling back to one call per document"""
+    if len(texts) == 1:
+        return [await analyze_with_gemini(texts[0])]
+    
+    try:
+        documents = "\n".join(f"<DOC {i}>\n{text[:GEMINI_TEXT_LIMIT]}\n</DOC {i}>" for i, text in enumerate(texts))
+        prompt = f"""
+        You are an expert startup investment analyst. Analyze each of the following {len(texts)} startup documents independently and provide a comprehensive evaluation of each.
+
+        Each document is enclosed between <DOC i> and </DOC i> tags, numbered from 0:
+        {documents}
+
+        Based on each document, extract and analyze:
+        {_ANALYSIS_CRITERIA}
+
+        Return ONLY a valid JSON array of exactly {len(texts)} objects, one per document in DOC order, each in this exact format:
+        {_ANALYSIS_JSON_FORMAT}
+        """
+        
+        # One round trip for the whole group instead of one per document
+        response = await generate_with_backoff(prompt, generation_config=_GROUP_GENERATION_CONFIG)
+        analyses = orjson.loads(_parse_gemini_json(response))
+        if not isinstance(analyses, list) or len(analyses) != len(texts):
+            raise ValueError(f"expected a JSON array of {len(texts)} analyses")
+        
+        for text, analysis in zip(texts, analyses):
+            if _is_valid_analysis(analysis):
+                gemini_cache[_gemini_cache_key(text)] = orjson.dumps(analysis)
+        logger.info(f"Gemini batch analysis completed for {len(texts)} documents")
+        return analyses
+        
+    except Exception as e:
+        logger.error(f"Failed to analyze batch with Gemini, analyzing documents individually: {e}")
+        return list(await asyncio.gather(*(analyze_with_gemini(text) for text in texts)))
+
+async def analyze_batch_with_gemini(texts: List[str]) -> List[Any]:
+    """Analyze several documents, sending uncached ones to Gemini in groups of GEMINI_BATCH_SIZE
+    
+    Elements are Gemini's output as returned; check them with _is_valid_analysis before scoring.
+    """
+    analyses: List[Any] = [None] * len(texts)
+    pending = []
+    for i, text in enumerate(texts):
+        cached_json = gemini_cache.get(_gemini_cache_key(text))
+        if cached_json is not None:
+            analyses[i] = orjson.loads(cached_json)
+        else:
+            pending.append(i)
+    
+    groups = [pending[start:start + GEMINI_BATCH_SIZE] for start in range(0, len(pending), GEMINI_BATCH_SIZE)]
+    group_analyses = await asyncio.gather(*(_analyze_document_group([texts[i] for i in group]) for group in groups))
+    for group, results in zip(groups, group_analyses):
+        for i, analysis in zip(group, results):
+            analyses[i] = analysis
+    
+    logger.info(f"Gemini analyses for {len(texts)} documents, {len(texts) - len(pending)} served from cache")
+    return analyses
+
+def _is_valid_analysis(analysis: Any) -> bool:
+    """Whether a Gemini analysis is a dict whose category scores can be scored"""
+    if not isinstance(analysis, dict):
+        return False
+    for category in _SCORE_CATEGORIES:
+        details = analysis.get(category, {})
+        if not isinstance(details, dict) or not isinstance(details.get("score", 0), (int, float)):
+            return False
+    return True
+
+def _category_scores(analysis: Dict[str, Any]) -> List[float]:
+    """Raw category scores in _SCORE_CATEGORIES order, 0 where missing"""
+    return [analysis.get(category, {}).get("score", 0) for category in _SCORE_CATEGORIES]
+
 def calculate_overall_score(analysis: Dict[str, Any]) -> float:
     """Calculate overall score from category scores"""
-    scores = [
-        analysis.get("financial_health", {}).get("score", 0),
-        analysis.get("team_quality", {}).get("score", 0),
-        analysis.get("market_opportunity", {}).get("score", 0),
-        analysis.get("product_traction", {}).get("score", 0),
-        100 - analysis.get("risk_assessment", {}).get("score", 0)  # Risk is inverse
-    ]
+    scores = _category_scores(analysis)
+    scores[-1] = 100 - scores[-1]  # Risk is inverse
     return sum(scores) / len(scores)
 
+def calculate_overall_scores(category_scores) -> np.ndarray:
+    """Overall scores for an (n, 5) array of raw category scores, e.g. BigQuery result columns in _SCORE_CATEGORIES order"""
+    scores = np.array(category_scores, dtype=np.float64).reshape(-1, len(_SCORE_CATEGORIES))
+    scores[:, -1] = 100 - scores[:, -1]  # Risk is inverse
+    # Summing along each row adds the five columns left to right, matching calculate_overall_score exactly
+    return scores.sum(axis=1) / len(_SCORE_CATEGORIES)
+
 def get_investment_recommendation(overall_score: float) -> str:
     """Get investment recommendation based on overall score"""
     if overall_score >= 90:
@@ -196,6 +450,40 @@ def get_investment_recommendation(overall_score: float) -> str:
     else:
         return "Sell"
 
+async def _upload_and_extract(file: UploadFile, filename: str) -> str:
+    """Upload a deck to GCS while extracting its text from the same local content"""
+    pdf_source = await asyncio.to_thread(_stage_upload, file.file)
+    try:
+        extracted_text, _ = await asyncio.gather(
+            extract_text_with_vision(pdf_source, max_chars=GEMINI_TEXT_LIMIT),
+            upload_to_gcs(pdf_source, filename)
+        )
+    finally:
+        if isinstance(pdf_source, str):
+            os.remove(pdf_source)
+    return extracted_text
+
+def _evaluation_result(startup_id: str, analysis: Dict[str, Any], overall_score: float) -> Dict[str, Any]:
+    """Build the evaluation response for one startup"""
+    return {
+        "startup_id": startup_id,
+        "overall_score": round(overall_score, 2),
+        "recommendation": get_investment_recommendation(overall_score),
+        "confidence_level": "High" if overall_score > 80 else "Medium" if overall_score > 60 else "Low",
+        "financial_health": analysis.get("financial_health", {"score": 0, "details": "Not analyzed"}),
+        "team_quality": analysis.get("team_quality", {"score": 0, "details": "Not analyzed"}),
+        "market_opportunity": analysis.get("market_opportunity", {"score": 0, "details": "Not analyzed"}),
+        "product_traction": analysis.get("product_traction", {"score": 0, "details": "Not analyzed"}),
+        "risk_assessment": analysis.get("risk_assessment", {"score": 0, "details": "Not analyzed"}),
+        "peer_comparison": {
+            "sector_avg": 75.5,
+            "vs_avg": "above average" if overall_score > 75.5 else "below average"
+        },
+        "realtime_status": "Analysis complete!",
+        "error": None,
+        "raw_analysis": analysis.get("overall_analysis", "Analysis completed successfully")
+    }
+
 @app.post("/evaluate-startup")
 async def evaluate_startup(file: UploadFile = File(...)):
     """Evaluate startup document using AI services"""
@@ -207,16 +495,9 @@ async def evaluate_startup(file: UploadFile = File(...)):
         timestamp = datetime.now().timestamp()
         filename = f"startup-{hashlib.md5(file.filename.encode()).hexdigest()}-{timestamp:.0f}.pdf"
         
-        # Read file content
-        file_content = await file.read()
-        
-        # Step 1: Upload to Google Cloud Storage
-        logger.info("Uploading file to Cloud Storage...")
-        gcs_uri = await upload_to_gcs(file_content, filename)
-        
-        # Step 2: Extract text using Cloud Vision API
-        logger.info("Extracting text with Cloud Vision API...")
-        extracted_text = await extract_text_with_vision(gcs_uri)
+        # Steps 1-2: Upload to Google Cloud Storage and extract text from the same local content concurrently
+        logger.info("Uploading file to Cloud Storage and extracting text...")
+        extracted_text = await _upload_and_extract(file, filename)
         
         if not extracted_text:
             raise HTTPException(status_code=500, detail="No text could be extracted from the PDF")
@@ -227,29 +508,10 @@ async def evaluate_startup(file: UploadFile = File(...)):
         
         # Step 4: Calculate overall score and recommendation
         overall_score = calculate_overall_score(analysis)
-        recommendation = get_investment_recommendation(overall_score)
         
         # Step 5: Prepare response
         startup_id = f"startup-{hashlib.md5(file.filename.encode()).hexdigest()}-{timestamp:.0f}"
-        
-        result = {
-            "startup_id": startup_id,
-            "overall_score": round(overall_score, 2),
-            "recommendation": recommendation,
-            "confidence_level": "High" if overall_score > 80 else "Medium" if overall_score > 60 else "Low",
-            "financial_health": analysis.get("financial_health", {"score": 0, "details": "Not analyzed"}),
-            "team_quality": analysis.get("team_quality", {"score": 0, "details": "Not analyzed"}),
-            "market_opportunity": analysis.get("market_opportunity", {"score": 0, "details": "Not analyzed"}),
-            "product_traction": analysis.get("product_traction", {"score": 0, "details": "Not analyzed"}),
-            "risk_assessment": analysis.get("risk_assessment", {"score": 0, "details": "Not analyzed"}),
-            "peer_comparison": {
-                "sector_avg": 75.5,
-                "vs_avg": "above average" if overall_score > 75.5 else "below average"
-            },
-            "realtime_status": "Analysis complete!",
-            "error": None,
-            "raw_analysis": analysis.get("overall_analysis", "Analysis completed successfully")
-        }
+        result = _evaluation_result(startup_id, analysis, overall_score)
         
         logger.info(f"Evaluation completed for {startup_id} with score {overall_score}")
         return result
@@ -260,6 +522,65 @@ async def evaluate_startup(file: UploadFile = File(...)):
         logger.error(f"Unexpected error during evaluation: {e}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {e}")
 
+@app.post("/evaluate-startups-batch")
+async def evaluate_startups_batch(files: List[UploadFile] = File(...)):
+    """Evaluate several startup documents, analyzing them with batched Gemini calls"""
+    for file in files:
+        if not file.filename.endswith(".pdf"):
+            raise HTTPException(status_code=400, detail=f"Only PDF files are supported: {file.filename}")
+    
+    try:
+        # The index keeps object names unique when two uploads share a filename
+        timestamp = datetime.now().timestamp()
+        startup_ids = [
+            f"startup-{hashlib.md5(file.filename.encode()).hexdigest()}-{timestamp:.0f}-{i}"
+            for i, file in enumerate(files)
+        ]
+        
+        # Steps 1-2: Upload and extract every deck concurrently
+        logger.info(f"Uploading and extracting text from {len(files)} files...")
+        texts = await asyncio.gather(*(
+            _upload_and_extract(file, f"{startup_id}.pdf") for file, startup_id in zip(files, startup_ids)
+        ), return_exceptions=True)
+        
+        # A failed upload or extraction fails only its own document
+        results: List[Dict[str, Any]] = []
+        analyzed = []
+        for i, (startup_id, text) in enumerate(zip(startup_ids, texts)):
+            if isinstance(text, BaseException):
+                logger.error(f"Upload or extraction failed for {startup_id}: {text}")
+                results.append({"startup_id": startup_id, "error": getattr(text, "detail", None) or str(text)})
+            else:
+                results.append({"startup_id": startup_id, "error": "No text could be extracted from the PDF"})
+                if text:
+                    analyzed.append(i)
+        
+        # Step 3: Analyze with Gemini, several documents per call
+        logger.info("Analyzing with Gemini Pro in batches...")
+        analyses = await analyze_batch_with_gemini([texts[i] for i in analyzed])
+        
+        # A malformed element of Gemini's array fails only its own document
+        scored = []
+        for i, analysis in zip(analyzed, analyses):
+            if _is_valid_analysis(analysis):
+                scored.append((i, analysis))
+            else:
+                results[i] = {"startup_id": startup_ids[i], "error": "Gemini returned no usable analysis for this document"}
+        
+        # Steps 4-5: Score all analyses in one pass and prepare responses
+        overall_scores = calculate_overall_scores([_category_scores(analysis) for _, analysis in scored])
+        for (i, analysis), overall_score in zip(scored, overall_scores.tolist()):
+            results[i] = _evaluation_result(startup_ids[i], analysis, overall_score)
+        
+        logger.info(f"Batch evaluation completed for {len(scored)} of {len(files)} files")
+        return results
+        
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        logger.error(f"Unexpected error during batch evaluation: {e}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {e}")
+
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8080))
     uvicorn.run(app, host="0.0.0.0", port=port)
@@ -6,6 +6,7 @@ Integrates all services: Agent Orchestration, Authentication, Cloud Storage, Big
 from fastapi import FastAPI, HTTPException, File, UploadFile, Depends, Security, BackgroundTasks, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from google.cloud import vision, storage, bigquery, aiplatform
 import vertexai
 from vertexai.generative_models import GenerativeModel
@@ -34,7 +35,8 @@ app = FastAPI(
     description="Complete AI-powered startup evaluation platform with agent orchestration, authentication, and analytics",
     version="3.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse  # workflow results are large nested dicts; orjson encodes them in C
 )
 
 # Add CORS middleware
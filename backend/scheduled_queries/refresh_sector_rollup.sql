@@ -0,0 +1,26 @@
+-- Daily materialization of per-sector peer aggregates read by
+-- BigQueryAnalyticsService.get_peer_comparison.
+-- The project and dataset placeholders are substituted by the deploy scripts
+-- when the BigQuery scheduled query is created.
+CREATE OR REPLACE TABLE `${PROJECT_ID}.${DATASET_ID}.sector_dashboard_rollup`
+CLUSTER BY sector
+AS
+SELECT
+    s.sector,
+    COUNT(*) AS total_companies,
+    AVG(s.arr_crore) AS avg_arr,
+    APPROX_QUANTILES(s.arr_crore, 100)[OFFSET(50)] AS median_arr,
+    APPROX_QUANTILES(s.arr_crore, 100)[OFFSET(75)] AS p75_arr,
+    APPROX_QUANTILES(s.arr_crore, 100)[OFFSET(90)] AS p90_arr,
+    AVG(s.team_size) AS avg_team_size,
+    AVG(e.financial_health_score) AS avg_financial_score,
+    AVG(e.team_quality_score) AS avg_team_score,
+    AVG(e.market_opportunity_score) AS avg_market_score,
+    AVG(e.product_traction_score) AS avg_traction_score,
+    AVG(e.overall_score) AS avg_overall_score,
+    CURRENT_TIMESTAMP() AS refreshed_at
+FROM `${PROJECT_ID}.${DATASET_ID}.evaluations` e
+JOIN `${PROJECT_ID}.${DATASET_ID}.startups` s
+ON e.startup_id = s.startup_id
+WHERE e.evaluated_at >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL 365 DAY)
+GROUP BY s.sector;
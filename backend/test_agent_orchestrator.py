@@ -0,0 +1,57 @@
+"""
+Tests for the orchestrator's low-confidence extraction short-circuit
+"""
+
+from agent_orchestrator import (
+    AgentOrchestrator,
+    AgentResult,
+    AgentStatus,
+    _MIN_CONF,
+    _WorkflowRun,
+    _low_confidence_result,
+)
+
+def _run_with_confidence(confidence=None) -> _WorkflowRun:
+    """Workflow run whose document intelligence step completed with the given extraction confidence"""
+    result = {} if confidence is None else {"extraction_confidence": confidence}
+    run = _WorkflowRun(file_content=b"", filename="deck.pdf", future=None)
+    run.results["document_intelligence"] = AgentResult(
+        agent_name="DocumentIntelligenceAgent",
+        status=AgentStatus.COMPLETED,
+        result=result
+    )
+    return run
+
+def test_low_confidence_run_is_flagged_for_review():
+    run = _run_with_confidence(_MIN_CONF - 0.1)
+    
+    assert AgentOrchestrator()._needs_review(run) is True
+    
+    recommendation = run.results["investment_recommendation"]
+    assert recommendation.status is AgentStatus.COMPLETED
+    assert recommendation.result["recommendation"] == "Needs Review"
+    assert recommendation.result["extraction_confidence"] == _MIN_CONF - 0.1
+    assert run.status["investment_recommendation"] is AgentStatus.COMPLETED
+    assert run.successful_agents == 1
+    assert run.error is None
+
+def test_confident_run_continues_to_analysis():
+    run = _run_with_confidence(_MIN_CONF)
+    
+    assert AgentOrchestrator()._needs_review(run) is False
+    assert "investment_recommendation" not in run.results
+    assert run.successful_agents == 0
+
+def test_missing_confidence_is_treated_as_confident():
+    run = _run_with_confidence()
+    
+    assert AgentOrchestrator()._needs_review(run) is False
+    assert "investment_recommendation" not in run.results
+
+def test_low_confidence_result_shape():
+    result = _low_confidence_result(0.2)
+    
+    assert result.agent_name == "InvestmentRecommendationAgent"
+    assert result.status is AgentStatus.COMPLETED
+    assert result.result["confidence"] == "Low"
+    assert len(result.result["investment_rationale"]) == 2
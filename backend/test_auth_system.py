@@ -0,0 +1,35 @@
+"""
+Tests for JWT verification payload isolation
+"""
+
+from auth_system import AuthenticationService
+
+def _admin_token(service: AuthenticationService) -> str:
+    """Fresh token for the seeded admin user"""
+    return service.generate_token(service.users["admin"])
+
+def test_mutating_verified_payload_does_not_leak_into_cache():
+    service = AuthenticationService()
+    token = _admin_token(service)
+    
+    first = service.verify_token(token)
+    first["permissions"].append("evil")
+    first["username"] = "mallory"
+    
+    second = service.verify_token(token)
+    assert second["permissions"] == ["read", "write", "delete", "admin"]
+    assert second["username"] == "admin"
+    
+    # A cache hit must not hand out the same containers twice either
+    second["permissions"].append("evil")
+    assert service.verify_token(token)["permissions"] == ["read", "write", "delete", "admin"]
+
+def test_batch_results_for_repeated_token_are_independent():
+    service = AuthenticationService()
+    token = _admin_token(service)
+    
+    first, second = service.verify_tokens_batch([token, token])
+    first["permissions"].append("evil")
+    
+    assert second["permissions"] == ["read", "write", "delete", "admin"]
+    assert service.verify_token(token)["permissions"] == ["read", "write", "delete", "admin"]
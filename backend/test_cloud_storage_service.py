@@ -0,0 +1,54 @@
+"""
+Tests for size-based download routing in CloudStorageService
+"""
+
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("google.cloud.storage")
+
+import cloud_storage_service
+from cloud_storage_service import CloudStorageService
+
+def _service_with_blob(size: int, data: bytes):
+    """Service whose bucket hands out one mock blob reporting the given size after reload()"""
+    blob = mock.Mock()
+    blob.size = None
+    blob.reload.side_effect = lambda **kwargs: setattr(blob, "size", size)
+    blob.download_as_bytes.return_value = data
+    
+    service = CloudStorageService.__new__(CloudStorageService)
+    service.bucket = mock.Mock()
+    service.bucket.blob.return_value = blob
+    return service, blob
+
+def test_large_blob_without_listing_size_uses_ranged_download(monkeypatch):
+    data = b"x" * 64
+    service, blob = _service_with_blob(CloudStorageService.PARALLEL_DOWNLOAD_THRESHOLD + 1, data)
+    
+    def fake_download_chunks_concurrently(source_blob, filename, **kwargs):
+        assert source_blob is blob
+        with open(filename, "wb") as f:
+            f.write(data)
+    
+    monkeypatch.setattr(
+        cloud_storage_service.transfer_manager, "download_chunks_concurrently", fake_download_chunks_concurrently
+    )
+    
+    assert service.download_file("raw_documents/big.pdf") == data
+    blob.reload.assert_called_once()
+    blob.download_as_bytes.assert_not_called()
+
+def test_small_blob_uses_single_download():
+    service, blob = _service_with_blob(1024, b"small")
+    
+    assert service.download_file("raw_documents/small.pdf") == b"small"
+    blob.reload.assert_called_once()
+    blob.download_as_bytes.assert_called_once()
+
+def test_listing_size_below_threshold_skips_the_probe():
+    service, blob = _service_with_blob(1024, b"small")
+    
+    assert service.download_file("raw_documents/small.pdf", size_bytes=1024) == b"small"
+    blob.reload.assert_not_called()
@@ -0,0 +1,19 @@
+"""
+Timestamp helpers shared by the backend services
+"""
+
+import time
+from datetime import datetime, timezone
+
+# (epoch second, formatted timestamp) for now_iso
+_iso_cache = (0, "")
+
+def now_iso() -> str:
+    """Current UTC time as ISO-8601 at second resolution, reformatted only when the second changes"""
+    global _iso_cache
+    second, text = _iso_cache
+    now = int(time.time())
+    if now != second:
+        text = datetime.fromtimestamp(now, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        _iso_cache = (now, text)
+    return text